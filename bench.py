@@ -0,0 +1,400 @@
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import PageCommandResponsePayload, PageCommandsBatchResponsePayload
+
+import main
+
+# Banc d'essai sans client Flet : une page factice reçoit les mises à jour
+# de main.py, dont les fonctions sont appelées via page.session("hooks").
+# Usage : python bench.py --keys 5000 --props 20 --json resultats.json
+#         python bench.py --keys 20000 --memory   (catalogue brut vs compact)
+#         python bench.py --compare resultats.json
+
+
+# --- CONNEXION FACTICE ---
+class StubConnection(Connection):
+    # Répond aux commandes comme le ferait le client et compte les envois
+    def __init__(self):
+        super().__init__()
+        self._ids = itertools.count(1)
+        self.batches = 0
+        self.bytes = 0
+        self.added = 0  # Contrôles que le client a dû enregistrer
+
+    def send_command(self, session_id, command):
+        return PageCommandResponsePayload(result="", error="")
+
+    def send_commands(self, session_id, commands):
+        self.batches += 1
+        self.bytes += sum(
+            len(str(command)) + sum(len(str(sub.attrs)) for sub in command.commands)
+            for command in commands
+        )
+        results = [
+            " ".join(f"_{next(self._ids)}" for _ in command.commands)
+            for command in commands if command.name == "add"
+        ]
+        self.added += sum(len(command.commands) for command in commands if command.name == "add")
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+
+def make_page():
+    connection = StubConnection()
+    page = ft.Page(connection, "bench", asyncio.new_event_loop(), ThreadPoolExecutor())
+    return page, connection
+
+
+# --- DONNÉES SYNTHÉTIQUES ---
+def generate_docs(path, keys, props, desc_chars, large_props=0):
+    # Composants « Comp00042 » avec description (et bloc de code) et
+    # propriétés ; le dernier en a `large_props` s'il est donné
+    filler = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (desc_chars // 56 + 1))
+    docs = {}
+    for i in range(keys):
+        docs[f"Comp{i:05d}"] = {
+            "description": f"Composant {i}. {filler[:desc_chars]}\n```python\nComp{i:05d}(width=100)\n```",
+            "properties": {
+                f"prop{j}": {
+                    "type": ("int", "str", "bool", "Callable")[j % 4],
+                    "default": j,
+                    "required": j % 5 == 0,
+                    "description": f"Propriété {j} de Comp{i:05d}."
+                }
+                for j in range(large_props if large_props and i == keys - 1 else props)
+            }
+        }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(docs, f)
+    return list(docs)
+
+
+# --- MESURES ---
+def measure(fn, repeat):
+    # Renvoie (médiane en ms, min en ms, pic mémoire en Ko) ; le pic est
+    # mesuré sur une exécution à part, tracemalloc ralentissant le code.
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), min(timings), peak / 1024
+
+
+class GCMonitor:
+    # Nombre et durée cumulée des passes du ramasse-miettes
+    def __init__(self):
+        self.collections = 0
+        self.pause = 0.0
+        self._started = None
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.collections += 1
+            self.pause += time.perf_counter() - self._started
+
+    def __enter__(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self._callback)
+
+
+def churn(connection, fn, count):
+    # Exécute fn(i) `count` fois et mesure allocations, GC et contrôles ajoutés
+    added = connection.added
+    gc.collect()
+    tracemalloc.start()
+    with GCMonitor() as monitor:
+        started = time.perf_counter()
+        for i in range(count):
+            fn(i)
+        elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    return elapsed * 1000 / count, {
+        'controls_added': round((connection.added - added) / count, 1),
+        'live_blocks': blocks,
+        'gc_runs': monitor.collections,
+        'gc_pause_ms': round(monitor.pause * 1000, 2),
+    }
+
+
+def wait_for(predicate, timeout=600):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Délai dépassé pendant le banc d'essai")
+        time.sleep(0.005)
+
+
+def bench_load(hooks, path, keys):
+    # Chargement complet via pick_file_result, jusqu'à la fin de l'action
+    # load_file (catalogue affiché, tiroir et première vue construits)
+    done = hooks['loads_done']()
+    started = time.perf_counter()
+    hooks['pick_file_result'](SimpleNamespace(files=[SimpleNamespace(path=path)], path=None))
+    wait_for(lambda: hooks['loads_done']() > done)
+    elapsed = (time.perf_counter() - started) * 1000
+    if len(hooks['catalog']()) != keys:
+        raise RuntimeError(f"Chargement de {path} échoué")
+    # L'index plein texte se construit en arrière-plan : on l'attend pour
+    # qu'il ne fausse pas les mesures suivantes.
+    wait_for(lambda: hooks['fulltext_index']() is not None)
+    return elapsed
+
+
+def run(args):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    os.chdir(workdir)  # Instantanés et favoris isolés dans le dossier temporaire
+    path = os.path.join(workdir, "docs.json")
+    keys = generate_docs(path, args.keys, args.props, args.desc_chars, args.large_props)
+    size_mb = os.path.getsize(path) / 1e6
+
+    page, connection = make_page()
+    main.main(page)
+    hooks = page.session.get("hooks")
+    batcher = page.session.get("update_batcher")
+
+    def record(name, ms, best=None, peak_kb=None, **extra):
+        results[name] = dict(ms=round(ms, 3), **extra)
+        if best is not None:
+            results[name]['min_ms'] = round(best, 3)
+        if peak_kb is not None:
+            results[name]['peak_kb'] = round(peak_kb, 1)
+
+    # Chargement à froid puis à chaud (instantané)
+    record("load_cold", bench_load(hooks, path, args.keys), size_mb=round(size_mb, 1))
+    wait_for(lambda: os.path.exists(main.snapshot_path(path, 'full')))
+    # Le catalogue partagé est oublié : la seconde ouverture relit l'instantané
+    main.catalog_store.evict([path])
+    record("load_warm", bench_load(hooks, path, args.keys), size_mb=round(size_mb, 1))
+
+    # Filtrage du drawer
+    for query in ("", "comp", "comp012", "introuvable"):
+        found = len(hooks['filter_drawer_keys'](query))
+        record(f"filter_drawer_keys[{query!r}]",
+               *measure(lambda: hooks['filter_drawer_keys'](query), args.repeat),
+               results=found)
+
+    # Liste du drawer (entrées réutilisées après le premier passage)
+    def update_drawer():
+        with batcher.action('bench'):
+            hooks['update_drawer_items']()
+
+    record("update_drawer_items", *measure(update_drawer, args.repeat))
+
+    # Défilement du drawer jusqu'à la fin, un écran à la fois : la fenêtre
+    # d'entrées est réaffectée, le coût par écran ne doit pas croître
+    viewport = 800
+    screens = len(keys) * main.DRAWER_ITEM_HEIGHT // viewport + 1
+    added = connection.added
+    timings = []
+    for i in range(screens):
+        started = time.perf_counter()
+        hooks['drawer_scroll'](SimpleNamespace(pixels=i * viewport, viewport_dimension=viewport))
+        timings.append((time.perf_counter() - started) * 1000)
+    record(f"défilement drawer x{screens}", sum(timings), min(timings),
+           median_ms=round(statistics.median(timings), 3), last_ms=round(timings[-1], 3), max_ms=round(max(timings), 3),
+           controls_added=connection.added - added)
+    hooks['drawer_scroll'](SimpleNamespace(pixels=0, viewport_dimension=viewport))
+
+    # Vue détaillée : construction sans cache, puis une sélection complète
+    sample = keys[len(keys) // 2]
+    hooks['select_component'](sample)
+    view = hooks['render_detail_view']()
+    record("render_detail_view",
+           *measure(hooks['render_detail_view'], args.repeat),
+           controls=main.count_controls(view))
+
+    component = hooks['catalog']()[sample]
+
+    def render_rows():
+        last = len(component) - 1
+        for i in range(len(component)):
+            hooks['render_property_row'](component.property(i), i == 0, i == last)
+
+    row = hooks['render_property_row'](component.property(0), True, False)
+    record(f"render_property_row x{len(component)}",
+           *measure(render_rows, args.repeat),
+           controls_per_row=main.count_controls(row))
+
+    # Composant à nombreuses propriétés, défilé jusqu'au bout : chaque
+    # tranche doit coûter autant que la première
+    if args.large_props:
+        hooks['select_component'](keys[-1])
+        view = hooks['displayed_view']()
+        timings = []
+        added = connection.added
+        while view.controls[-2].visible:  # Pied « Afficher plus » avant la marge
+            started = time.perf_counter()
+            view.on_scroll(SimpleNamespace(pixels=0, max_scroll_extent=0))
+            timings.append((time.perf_counter() - started) * 1000)
+        record(f"défilement propriétés x{len(timings)}", sum(timings), min(timings),
+               first_ms=round(timings[0], 3), last_ms=round(timings[-1], 3),
+               controls_added=connection.added - added)
+
+    # Sélection d'un composant : un envoi, octets transmis au client
+    targets = itertools.cycle(keys[::max(len(keys) // 97, 1)])
+    batches, sent = connection.batches, connection.bytes
+    ms, best, peak = measure(lambda: hooks['select_component'](next(targets)), args.repeat)
+    selections = args.repeat + 1
+    record("select_component", ms, best, peak,
+           updates=round((connection.batches - batches) / selections, 2),
+           kb_sent=round((connection.bytes - sent) / selections / 1024, 1))
+
+    # Navigation rapide : le cache de vues déborde, le drawer change de filtre
+    step = max(len(keys) // 211, 1)
+    ms, stats = churn(connection, lambda i: hooks['select_component'](keys[(i * step) % len(keys)]), 200)
+    record("navigation x200", ms, **stats)
+
+    # Parcours pas à pas, au rythme d'un utilisateur : les voisins sont
+    # préconstruits entre deux sélections
+    stats = hooks['prefetch_stats']
+    hits, shown = stats.hits, stats.hits + stats.misses
+    start = len(keys) // 3
+    timings = []
+    for i in range(50):
+        started = time.perf_counter()
+        hooks['select_component'](keys[(start + i) % len(keys)])
+        timings.append((time.perf_counter() - started) * 1000)
+        time.sleep(main.PREFETCH_DELAY + 0.05)
+    record("navigation séquentielle x50", statistics.median(timings), min(timings),
+           hit_rate=round((stats.hits - hits) / (stats.hits + stats.misses - shown), 2))
+
+    # Flèche bas répétée : suivant dans la liste filtrée, sans re-tri
+    with batcher.action('bench'):
+        hooks['update_drawer_items'](query="")
+    ms, stats = churn(connection, lambda i: hooks['navigate'](1), 200)
+    record("navigate x200", ms, **stats)
+
+    def refilter(i):
+        with batcher.action('bench'):
+            hooks['update_drawer_items'](query=keys[(i * step) % len(keys)][:-2].lower())
+
+    ms, stats = churn(connection, refilter, 50)
+    record("update_drawer_items refiltre x50", ms, **stats)
+
+    return results
+
+
+def memory_report(path):
+    # Mémoire retenue par le catalogue décodé : dictionnaires bruts de
+    # json.loads, puis forme compacte (ComponentDoc) qu'utilise l'application
+    with open(path, 'rb') as f:
+        data = f.read()
+    report = {}
+    for name, build in (("dict", json.loads), ("compact", lambda d: main.compact_catalog(json.loads(d)))):
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        catalog = build(data)
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        report[name] = {'kb': round(retained / 1024, 1), 'ms': round(elapsed * 1000, 1)}
+        del catalog
+    report['ratio'] = round(report['compact']['kb'] / report['dict']['kb'], 3)
+    return report
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'flet': getattr(ft, '__version__', None) or _flet_version(),
+        'json_backend': main.JSON_BACKEND,
+        'platform': platform.platform(),
+    }
+
+
+def _flet_version():
+    try:
+        from importlib.metadata import version
+        return version("flet")
+    except Exception:
+        return None
+
+
+def print_report(results, baseline=None):
+    print(f"{'mesure':<36}{'médiane ms':>12}{'min ms':>10}{'pic Ko':>10}  détails")
+    for name, row in results.items():
+        extra = {k: v for k, v in row.items() if k not in ('ms', 'min_ms', 'peak_kb')}
+        line = f"{name:<36}{row['ms']:>12.2f}{row.get('min_ms', row['ms']):>10.2f}"
+        line += f"{row['peak_kb']:>10.0f}" if 'peak_kb' in row else f"{'':>10}"
+        if baseline and name in baseline:
+            delta = (row['ms'] / baseline[name]['ms'] - 1) * 100 if baseline[name]['ms'] else 0.0
+            line += f"  {delta:+.0f}%"
+        if extra:
+            line += "  " + ", ".join(f"{k}={v}" for k, v in extra.items())
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc d'essai de JSON Docs Viewer")
+    parser.add_argument("--keys", type=int, default=5000, help="nombre de composants")
+    parser.add_argument("--props", type=int, default=20, help="propriétés par composant")
+    parser.add_argument("--desc-chars", type=int, default=400, help="longueur des descriptions")
+    parser.add_argument("--large-props", type=int, default=1000,
+                        help="propriétés du dernier composant (0 : comme les autres)")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions par mesure")
+    parser.add_argument("--json", help="enregistre les résultats dans ce fichier")
+    parser.add_argument("--compare", help="compare à des résultats enregistrés")
+    parser.add_argument("--memory", action="store_true",
+                        help="compare la mémoire du catalogue brut et compact")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    if args.json:
+        args.json = os.path.abspath(args.json)
+
+    results = run(args)
+    env = environment()
+    print(" · ".join(f"{k} {v}" for k, v in env.items()))
+    print(f"{args.keys} composants · {args.props} propriétés · descriptions de {args.desc_chars} caractères")
+    print_report(results, baseline)
+
+    memory = None
+    if args.memory:
+        memory = memory_report(os.path.join(os.getcwd(), "docs.json"))
+        print(f"Catalogue en mémoire : dictionnaires {memory['dict']['kb'] / 1024:.1f} Mo "
+              f"({memory['dict']['ms']:.0f} ms), compact {memory['compact']['kb'] / 1024:.1f} Mo "
+              f"({memory['compact']['ms']:.0f} ms), soit x{memory['ratio']}")
+
+    if sys.platform != 'win32':
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"Mémoire résidente maximale : {rss:.0f} Mo")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'environment': env, 'args': vars(args), 'results': results, 'memory': memory},
+                      f, indent=2)
@@ -0,0 +1,151 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import main
+from bench import generate_docs, make_page, wait_for
+
+# Test de charge du mode serveur : N sessions factices (bench.StubConnection)
+# ouvrent le même catalogue, chargé une seule fois par le processus, et
+# parcourent quelques composants. Mesure la mémoire ajoutée par session.
+# Usage : python loadtest.py --sessions 200 --keys 5000 --json charge.json
+#
+# Le catalogue, ses index et les descriptions analysées sont partagés ;
+# chaque session ne garde que sa sélection, ses recherches, ses favoris et
+# ses contrôles Flet, qui font l'essentiel de son coût : page et tiroir,
+# vues détaillées en cache (SERVER_DETAIL_VIEW_CACHE_SIZE), vues
+# préconstruites (SERVER_PREFETCH_VIEW_CACHE_SIZE) et lignes de propriétés
+# recyclées. Mesuré avec 20 sessions, 5000 composants à 20 propriétés :
+# environ 2,7 Mo par session à l'ouverture, 5,2 Mo après 5 sélections,
+# quelle que soit la taille du fichier (le catalogue seul occupe 25 Mo).
+
+
+class LocalFavoritesStore(main.ClientFavoritesStore):
+    # Le client factice ne répond pas aux appels client_storage : les favoris
+    # de chaque session sont gardés ici, par le même chemin asynchrone
+    def __init__(self, page, delay=main.FAVORITES_SAVE_DELAY):
+        super().__init__(page, delay)
+        self._storage = {}
+
+    def _read(self, path):
+        return self._storage.get(path)
+
+    def _write(self, path, keys):
+        self._storage[path] = keys
+
+
+def open_session(keys):
+    page, connection = make_page()
+    main.main(page)
+    hooks = page.session.get("hooks")
+    # Fin de l'action load_file : tiroir et première vue construits
+    wait_for(lambda: hooks['loads_done']() > 0)
+    if len(hooks['catalog']()) != keys:
+        raise RuntimeError("Chargement de la session échoué")
+    return page, connection, hooks
+
+
+def close_session(page, hooks):
+    # Ce que fait le serveur Flet à la déconnexion : la boucle et l'exécuteur
+    # de la session s'arrêtent (ils gardent sinon la page en mémoire)
+    hooks['disconnect'](None)
+    page.loop.call_soon_threadsafe(page.loop.stop)
+    page.loop.run_forever()
+    page.loop.close()
+    page.executor.shutdown()
+
+
+def browse(hooks, keys, steps, offset):
+    # Quelques sélections, comme un utilisateur qui parcourt le drawer
+    stride = max(len(keys) // (steps + 1), 1)
+    for i in range(steps):
+        hooks['select_component'](keys[(offset + i * stride) % len(keys)])
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    os.chdir(workdir)  # Instantanés isolés dans le dossier temporaire
+    path = os.path.join(workdir, "docs.json")
+    keys = generate_docs(path, args.keys, args.props, args.desc_chars)
+
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    # Chargement au démarrage, comme `python main.py --server docs.json`
+    started = time.perf_counter()
+    main.SERVER_DOCS[:] = [path]
+    main.ClientFavoritesStore = LocalFavoritesStore
+    server = main.ServerCatalog(main.catalog_store, main.SERVER_DOCS)
+    wait_for(lambda: server.entry.fulltext_index is not None)
+    load_ms = (time.perf_counter() - started) * 1000
+    gc.collect()
+    shared = tracemalloc.get_traced_memory()[0] - base
+
+    sessions = []
+    per_session = []
+    started = time.perf_counter()
+    for i in range(args.sessions):
+        before = tracemalloc.get_traced_memory()[0]
+        page, connection, hooks = open_session(args.keys)
+        browse(hooks, keys, args.steps, i * 7)
+        sessions.append((page, connection, hooks))
+        gc.collect()
+        per_session.append(tracemalloc.get_traced_memory()[0] - before)
+    open_ms = (time.perf_counter() - started) * 1000
+    total = tracemalloc.get_traced_memory()[0] - base
+
+    # Fermeture des sessions : le catalogue reste chargé pour le serveur
+    for page, connection, hooks in sessions:
+        close_session(page, hooks)
+    sessions.clear()
+    gc.collect()
+    after_close = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    catalogs = main.catalog_store.stats()
+    server.close()
+
+    per_session.sort()
+    return {
+        'sessions': args.sessions,
+        'load_ms': round(load_ms, 1),
+        'shared_kb': round(shared / 1024, 1),
+        'session_kb_median': round(per_session[len(per_session) // 2] / 1024, 1),
+        'session_kb_max': round(per_session[-1] / 1024, 1),
+        'open_ms_per_session': round(open_ms / args.sessions, 2),
+        'total_kb': round(total / 1024, 1),
+        'after_close_kb': round(after_close / 1024, 1),
+        'catalogs_loaded': len(catalogs),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge du mode serveur")
+    parser.add_argument("--sessions", type=int, default=200, help="sessions simultanées")
+    parser.add_argument("--keys", type=int, default=5000, help="nombre de composants")
+    parser.add_argument("--props", type=int, default=20, help="propriétés par composant")
+    parser.add_argument("--desc-chars", type=int, default=400, help="longueur des descriptions")
+    parser.add_argument("--steps", type=int, default=5, help="sélections par session")
+    parser.add_argument("--json", help="enregistre les résultats dans ce fichier")
+    args = parser.parse_args()
+    if args.json:
+        args.json = os.path.abspath(args.json)
+
+    results = run(args)
+    print(f"{args.keys} composants · {args.props} propriétés · {args.sessions} sessions")
+    for name, value in results.items():
+        print(f"{name:<24}{value:>12}")
+
+    if sys.platform != 'win32':
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"Mémoire résidente maximale : {rss:.0f} Mo")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
@@ -1,7 +1,45 @@
 import flet as ft
 from flet import Icons, Colors
+import argparse
+import functools
+import hashlib
+import heapq
+import html
 import json
+import logging
+import marshal
+import math
+import mmap
+import multiprocessing
 import os
+import re
+import sys
+import threading
+import time
+import weakref
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from contextlib import closing, contextmanager
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
 
 
 # --- DICTIONNAIRE DE DÉFINITIONS ---
@@ -63,6 +101,1962 @@ COLORS = {
 }
 
 
+class ThemeRegistry:
+    # Associe des contrôles à leurs couleurs de thème. Changer de thème
+    # réapplique ces couleurs aux contrôles existants au lieu de reconstruire
+    # les vues ; les contrôles détruits disparaissent d'eux-mêmes du registre.
+    def __init__(self, theme):
+        self.theme = theme
+        self._bindings = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def bind(self, control, **attrs):
+        # attrs : attribut -> rôle de COLORS (ex. 'text') ou fonction(thème)
+        with self._lock:
+            self._bindings[control] = attrs
+        self._apply(control, attrs, self.theme)
+        return control
+
+    def set_theme(self, theme):
+        with self._lock:
+            self.theme = theme
+            bindings = list(self._bindings.items())
+        for control, attrs in bindings:
+            self._apply(control, attrs, theme)
+
+    @staticmethod
+    def _apply(control, attrs, theme):
+        for attr, role in attrs.items():
+            setattr(control, attr, role(theme) if callable(role) else theme[role])
+
+
+# --- REGROUPEMENT DES MISES À JOUR ---
+logger = logging.getLogger(__name__)
+
+
+# --- INSTRUMENTATION ---
+# Nombre de mesures conservées ; JSON_DOCS_TRACE=1 active les mesures au démarrage
+PERF_TRACE_SIZE = 5000
+PERF_TRACE_ENV = 'JSON_DOCS_TRACE'
+# Intervalle de rafraîchissement du panneau de performances, en secondes
+PERF_PANEL_INTERVAL = 1.0
+# Catégories du résumé : décodage, construction des contrôles, envoi au client
+PERF_CATEGORIES = {
+    'load': "Analyse",
+    'render_detail_view': "Construction",
+    'render_property_rows': "Construction",
+    'update_drawer_items': "Construction",
+    'prefetch_view': "Préchargement",
+    'send_commands': "Aller-retour Flet",
+}
+
+
+def count_controls(control):
+    return 1 + sum(count_controls(child) for child in control._get_children())
+
+
+class PerfTracer:
+    # Mesures optionnelles des chemins critiques. Désactivé, `span` ne coûte
+    # qu'un test ; activé, chaque mesure va dans un tampon borné, exportable
+    # au format Chrome Trace (chrome://tracing, Perfetto).
+    def __init__(self, enabled=False, size=PERF_TRACE_SIZE):
+        self.enabled = enabled
+        self.events = deque(maxlen=size)
+        self.recorded = 0  # Mesures enregistrées depuis le début
+        self.origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, **meta):
+        # Le dictionnaire `meta` peut être complété dans le bloc
+        if not self.enabled:
+            yield meta
+            return
+        started = time.perf_counter()
+        try:
+            yield meta
+        finally:
+            self.events.append((
+                name, started - self.origin, time.perf_counter() - started,
+                threading.get_ident(), meta
+            ))
+            self.recorded += 1
+
+    def instrument_connection(self, connection):
+        # Sépare l'aller-retour vers le client du calcul du diff par Flet ;
+        # la taille est estimée d'après les attributs envoyés.
+        send = connection.send_commands
+        
+        def send_commands(session_id, commands):
+            if not self.enabled:
+                return send(session_id, commands)
+            with self.span('send_commands', commands=len(commands)) as trace:
+                trace['payload_chars'] = sum(
+                    len(str(command)) + sum(len(str(sub.attrs)) for sub in command.commands)
+                    for command in commands
+                )
+                return send(session_id, commands)
+        
+        connection.send_commands = send_commands
+
+    def clear(self):
+        self.events.clear()
+
+    def summary(self):
+        # {nom: (nombre, total ms, max ms, dernières métadonnées)}
+        stats = {}
+        for name, _, duration, _, meta in list(self.events):
+            count, total, worst, _ = stats.get(name, (0, 0.0, 0.0, None))
+            stats[name] = (count + 1, total + duration * 1000, max(worst, duration * 1000), meta)
+        return stats
+
+    def breakdown(self):
+        # Temps total par catégorie, pour situer le goulot d'étranglement
+        totals = {}
+        for name, (_, total, _, _) in self.summary().items():
+            category = PERF_CATEGORIES.get(name)
+            if category:
+                totals[category] = totals.get(category, 0.0) + total
+        return totals
+
+    def export(self, path):
+        trace = {
+            'displayTimeUnit': 'ms',
+            'traceEvents': [
+                {
+                    'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': thread,
+                    'ts': round(started * 1e6, 1), 'dur': round(duration * 1e6, 1),
+                    'args': {k: v if isinstance(v, (int, float, str, dict)) else str(v)
+                             for k, v in meta.items()},
+                }
+                for name, started, duration, thread, meta in list(self.events)
+            ],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+        return len(trace['traceEvents'])
+
+
+class UpdateBatcher:
+    # Regroupe les page.update() d'une même action utilisateur : dans un bloc
+    # `with batcher.action(nom):` (ou une fonction décorée par `batched`), les
+    # demandes sont différées et un seul envoi a lieu en sortie du bloc le plus
+    # externe. `history` garde le nombre d'envois des dernières actions.
+    # Les actions d'une session sont exclusives : Flet exécute les handlers en
+    # parallèle sur son pool de threads, et minuteurs, surveillance et
+    # chargement modifient les mêmes arbres. Le verrou couvre la modification
+    # et l'envoi, sans quoi le diff de Flet voit des arbres à moitié construits.
+    def __init__(self, page, history_size=100, tracer=None):
+        self.page = page
+        self.tracer = tracer or PerfTracer()
+        self.history = deque(maxlen=history_size)
+        self._local = threading.local()  # Chaque handler Flet a son thread
+        self._lock = threading.RLock()
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, 'depth'):
+            state.depth = 0
+            state.action = None
+            state.full = False
+            state.controls = []
+            state.sent = 0
+        return state
+
+    def update(self, *controls):
+        # Sans argument : toute la page ; sinon seulement ces contrôles
+        state = self._state()
+        if not state.depth:
+            with self._lock:
+                self._send("(hors action)", controls)
+                self.history.append(("(hors action)", 1))
+            return
+        if not controls:
+            state.full = True
+        for control in controls:
+            if control not in state.controls:
+                state.controls.append(control)
+
+    def flush(self):
+        # Envoie tout de suite ce qui est en attente (ex. barre de progression)
+        state = self._state()
+        if state.full:
+            # La mise à jour de la page ne parcourt pas l'intérieur des
+            # contrôles isolés : ils partent dans le même envoi
+            isolated = [control for control in state.controls if control.is_isolated()]
+            self._send(state.action, (self.page, *isolated) if isolated else ())
+        elif state.controls:
+            self._send(state.action, state.controls)
+        else:
+            return
+        state.sent += 1
+        state.full = False
+        state.controls = []
+
+    def _send(self, action, controls):
+        with self.tracer.span('page.update', action=action) as trace:
+            trace['controls'] = len(controls) or 'page'
+            mounted = len(self.page.index)
+            self.page.update(*controls)
+            trace['mounted'] = len(self.page.index) - mounted
+
+    @contextmanager
+    def action(self, name):
+        state = self._state()
+        if not state.depth:
+            self._lock.acquire()
+            state.action = name
+            state.sent = 0
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+            if not state.depth:
+                try:
+                    self.flush()
+                    self.history.append((state.action, state.sent))
+                    if state.sent > 1:
+                        logger.debug("%s : %d page.update()", state.action, state.sent)
+                finally:
+                    self._lock.release()
+
+    def batched(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.action(fn.__name__):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def updates_per_action(self):
+        # {action: (nombre d'actions, envois moyens)} sur l'historique récent
+        totals = {}
+        for action, sent in self.history:
+            count, total = totals.get(action, (0, 0))
+            totals[action] = (count + 1, total + sent)
+        return {action: (count, total / count) for action, (count, total) in totals.items()}
+
+
+# --- DESCRIPTIONS ---
+CODE_BLOCK_PATTERN = re.compile(r'```python\s*([\s\S]*?)```')
+# Au-delà de cette longueur, la description est d'abord affichée repliée
+DESCRIPTION_PREVIEW_CHARS = 1500
+
+
+class DescriptionInfo:
+    # Analyse faite une seule fois par composant : texte normalisé, blocs de
+    # code extraits et aperçu replié pour les descriptions longues.
+    __slots__ = ('markdown', 'code_blocks', 'preview')
+
+    def __init__(self, description):
+        text = (description or '').replace('\r\n', '\n').strip()
+        self.markdown = text or '_Aucune description_'
+        self.code_blocks = [
+            code.strip() for code in CODE_BLOCK_PATTERN.findall(text) if code.strip()
+        ]
+        self.preview = None
+        if len(text) > DESCRIPTION_PREVIEW_CHARS:
+            # Coupe à une fin de paragraphe, sans laisser de bloc de code ouvert
+            cut = text.rfind('\n\n', 0, DESCRIPTION_PREVIEW_CHARS)
+            if cut < DESCRIPTION_PREVIEW_CHARS // 2:
+                cut = DESCRIPTION_PREVIEW_CHARS
+            preview = text[:cut].rstrip()
+            if preview.count('```') % 2:
+                preview += '\n```'
+            self.preview = preview + '\n\n…'
+
+    @property
+    def has_code(self):
+        return bool(self.code_blocks)
+
+
+# --- MODÈLE COMPACT ---
+def _intern_text(value):
+    # Texte affiché d'un type ou d'une valeur par défaut, partagé entre
+    # toutes les propriétés qui l'utilisent (« int », « None », « 0 »…)
+    return sys.intern(value if isinstance(value, str) else str(value))
+
+
+class ComponentDoc:
+    # Composant décodé, sans dictionnaire par propriété : les propriétés sont
+    # rangées en colonnes (tuples parallèles), `required` est un masque de
+    # bits, noms, types et défauts sont internés, et les explications de repli
+    # sont les chaînes mêmes de PROPERTY_DOCS. Immuable une fois construit.
+    __slots__ = ('description', 'names', 'types', 'defaults', 'required', 'explanations')
+
+    def __init__(self, description=None, names=(), types=(), defaults=(), required=0, explanations=None):
+        self.description = description
+        self.names = names
+        self.types = types
+        self.defaults = defaults
+        self.required = required
+        self.explanations = explanations  # None si aucune propriété n'en a
+
+    @classmethod
+    def from_json(cls, item):
+        if not isinstance(item, dict):
+            return cls()
+        description = item.get('description')
+        description = description if isinstance(description, str) else None
+        properties = item.get('properties')
+        if not isinstance(properties, dict) or not properties:
+            return cls(description)
+        names, types, defaults, explanations = [], [], [], []
+        required = 0
+        for i, (name, val) in enumerate(properties.items()):
+            if not isinstance(val, dict):
+                val = {}
+            names.append(sys.intern(name))
+            types.append(_intern_text(val.get('type', 'unknown')))
+            defaults.append(_intern_text(val.get('default', 'null')))
+            if val.get('required', False):
+                required |= 1 << i
+            explanations.append(val.get('description') or PROPERTY_DOCS.get(name))
+        if not any(explanation is not None for explanation in explanations):
+            explanations = None
+        return cls(
+            description, tuple(names), tuple(types), tuple(defaults), required,
+            tuple(explanations) if explanations else None
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def property(self, i):
+        # (nom, type, défaut, requis, explication) de la i-ème propriété
+        return (
+            self.names[i], self.types[i], self.defaults[i], bool(self.required >> i & 1),
+            self.explanations[i] if self.explanations else None
+        )
+
+    def state(self):
+        # Tuple sérialisable par marshal (instantanés) ; les chaînes internées
+        # le restent au rechargement.
+        return (self.description, self.names, self.types, self.defaults, self.required, self.explanations)
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(*state)
+
+    def __eq__(self, other):
+        return isinstance(other, ComponentDoc) and self.state() == other.state()
+
+    __hash__ = None
+
+
+def compact_catalog(data):
+    # Catalogue décodé d'un bloc -> {clé: ComponentDoc}
+    if not isinstance(data, dict):
+        raise ValueError("Le fichier doit contenir un objet JSON")
+    return {key: ComponentDoc.from_json(item) for key, item in data.items()}
+
+
+# --- PARAMÈTRES DU TIROIR ---
+# Hauteur fixe d'une entrée : la position de défilement donne directement
+# les entrées visibles, et des espaceurs remplacent celles hors fenêtre.
+DRAWER_ITEM_HEIGHT = 52
+# Entrées gardées au-dessus de la zone visible quand la fenêtre se déplace
+DRAWER_PAGE_SIZE = 60
+# Entrées construites en tout, quelle que soit la longueur de la liste : le
+# défilement les réaffecte à d'autres clés au lieu d'en ajouter. Chaque
+# déplacement re-diffe toute la fenêtre, d'où une taille modeste.
+DRAWER_WINDOW_SIZE = 2 * DRAWER_PAGE_SIZE
+
+
+# --- RACCOURCIS CLAVIER ---
+# (touche Flet, Ctrl ou Cmd) -> action. Sans modificateur, les raccourcis
+# sont ignorés pendant la saisie dans un champ de recherche (sauf Échap).
+KEYBOARD_SHORTCUTS = {
+    ('Arrow Down', False): 'next',
+    ('J', False): 'next',
+    ('Arrow Up', False): 'previous',
+    ('K', False): 'previous',
+    ('Page Down', False): 'next_page',
+    ('Page Up', False): 'previous_page',
+    ('Home', False): 'first',
+    ('End', False): 'last',
+    ('F', False): 'next_favorite',
+    ('/', False): 'search',
+    ('Escape', False): 'escape',
+    ('Arrow Down', True): 'next',
+    ('Arrow Up', True): 'previous',
+    ('K', True): 'search',
+}
+# Composants sautés par Page suivante / Page précédente
+KEYBOARD_PAGE_STEP = 10
+# Raccourcis répétés par une touche maintenue : les répétitions arrivées
+# pendant une navigation en cours sont ignorées au lieu de s'empiler
+KEYBOARD_REPEATABLE = {'next', 'previous', 'next_page', 'previous_page'}
+
+
+# --- PARAMÈTRES DE LA VUE DÉTAILLÉE ---
+# Nombre de propriétés construites à l'affichage, puis à chaque défilement
+PROPERTY_PAGE_SIZE = 30
+# Distance (px) à la fin de la liste qui déclenche la tranche suivante
+PROPERTY_LOAD_AHEAD = 1500
+# Lignes libérées gardées pour resservir : au-delà, elles sont abandonnées
+# (un composant à 2000 propriétés ne doit pas rester en mémoire)
+PROPERTY_ROW_POOL_SIZE = 4 * PROPERTY_PAGE_SIZE
+
+
+class PropertySlice(ft.Column):
+    # Une tranche de lignes de propriétés. Isolée : une fois envoyée, la
+    # mise à jour de la vue ne re-diffe plus ses lignes, et afficher la
+    # tranche suivante coûte autant sur un composant à 1000 propriétés qu'à
+    # 30. Toute modification ultérieure passe par ui.update(tranche).
+    def is_isolated(self):
+        return True
+
+
+# --- INDEX DE RECHERCHE ---
+# Résultats gardés pour les requêtes de 1 ou 2 caractères
+SEARCH_SHORT_CACHE_SIZE = 64
+
+
+class SearchIndex:
+    # Construit une seule fois par fichier : clés triées, clés en minuscules
+    # et listes de positions par caractère, bigramme et trigramme. Une
+    # requête de 1 à 3 caractères est une liste toute prête ; au-delà, la
+    # plus courte liste de ses trigrammes est filtrée.
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.lowered = [k.lower() for k in self.keys]
+        grams = {}
+        for i, k in enumerate(self.lowered):
+            for gram in {k[j:j + n] for n in (1, 2, 3) for j in range(len(k) - n + 1)}:
+                postings = grams.get(gram)
+                if postings is None:
+                    grams[gram] = [i]
+                else:
+                    postings.append(i)
+        self.grams = grams  # Listes partagées : jamais modifiées après coup
+        self._last = ("", range(len(self.keys)))
+        # Clés des requêtes de 1 ou 2 caractères (premières frappes, souvent
+        # des milliers de résultats) : seule une copie est faite ensuite
+        self._short = LRUCache(SEARCH_SHORT_CACHE_SIZE)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _positions(self, query):
+        if len(query) <= 3:
+            return self.grams.get(query, [])
+        postings = [self.grams.get(query[j:j + 3]) for j in range(len(query) - 2)]
+        if not all(postings):
+            return []
+        candidates = min(postings, key=len)
+        last_query, last_positions = self._last
+        if last_query and last_query in query and len(last_positions) < len(candidates):
+            # La frappe affine la requête précédente : on filtre ses résultats
+            candidates = last_positions
+        lowered = self.lowered
+        return [i for i in candidates if query in lowered[i]]
+
+    def search(self, query):
+        # Renvoie les clés contenant `query` (insensible à la casse), triées
+        query = query.lower()
+        if not query:
+            return list(self.keys)
+        if len(query) <= 2:
+            found = self._short.get(query)
+            if found is None:
+                found = [self.keys[i] for i in self.grams.get(query, ())]
+                self._short.put(query, found)
+            self._last = (query, self.grams.get(query, []))
+            return list(found)
+        positions = self._positions(query)
+        self._last = (query, positions)
+        return [self.keys[i] for i in positions]
+
+
+class KeyOrder(Sequence):
+    # Liste filtrée et ordonnée du tiroir, avec la position de chaque clé :
+    # suivant, précédent et `index` en O(1), sans re-trier ni parcourir.
+    def __init__(self, keys=()):
+        self.keys = keys if isinstance(keys, list) else list(keys)
+        self._positions = None  # Construit à la première recherche de position
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, i):
+        return self.keys[i]
+
+    @property
+    def positions(self):
+        if self._positions is None:
+            self._positions = {key: i for i, key in enumerate(self.keys)}
+        return self._positions
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def index(self, key, *args):
+        try:
+            return self.positions[key]
+        except KeyError:
+            raise ValueError(key) from None
+
+    def step(self, key, delta):
+        # Clé à `delta` positions de `key`, bornée aux extrémités ; depuis une
+        # clé absente de la liste, on part du début (ou de la fin).
+        if not self.keys:
+            return None
+        i = self.positions.get(key)
+        if i is None:
+            i = -1 if delta > 0 else len(self.keys)
+        return self.keys[min(max(i + delta, 0), len(self.keys) - 1)]
+
+
+# --- RECHERCHE PLEIN TEXTE ---
+# Poids de chaque champ dans le classement des résultats
+FULLTEXT_FIELD_WEIGHTS = {'key': 8.0, 'property': 4.0, 'type': 2.0, 'description': 1.0}
+# Nombre maximal de résultats classés affichés
+FULLTEXT_MAX_HITS = 50
+# Nombre maximal de termes de l'index couverts par un préfixe de requête
+FULLTEXT_MAX_EXPANSIONS = 200
+# Longueur minimale d'une requête plein texte
+FULLTEXT_MIN_QUERY = 2
+
+_WORD = re.compile(r'\w+')
+_SUBWORD = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+
+def tokenize(text):
+    # Mots en minuscules, plus leurs morceaux pour camelCase et snake_case
+    # (« ElevatedButton » donne aussi « elevated » et « button »).
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.append(word.lower())
+        parts = _SUBWORD.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+class FullTextIndex:
+    # Index inversé sur le nom, les propriétés, leurs types et la description
+    # de chaque composant : terme -> (composants, scores) en tableaux compacts,
+    # termes triés pour la recherche par préfixe.
+    def __init__(self, catalog, cancel=None):
+        started = time.perf_counter()
+        self.keys = list(catalog.keys())
+        building = {}
+        for doc, key in enumerate(self.keys):
+            if cancel is not None and doc % 256 == 0 and cancel.is_set():
+                raise LoadCancelled()
+            for token, score in self._document_scores(key, catalog[key]).items():
+                building.setdefault(token, {})[doc] = score
+        self.postings = {
+            token: (array('I', docs.keys()), array('f', docs.values()))
+            for token, docs in building.items()
+        }
+        self.terms = sorted(self.postings)
+        self.build_seconds = time.perf_counter() - started
+        self.memory_bytes = self._estimate_memory()
+
+    @staticmethod
+    def _document_scores(key, item):
+        counts = {}
+        
+        def add(text, field):
+            if isinstance(text, str):
+                for token in tokenize(text):
+                    counts[token, field] = counts.get((token, field), 0) + 1
+        
+        add(key, 'key')
+        add(item.description, 'description')
+        for name, type_ in zip(item.names, item.types):
+            add(name, 'property')
+            add(type_, 'type')
+        # Fréquence amortie : un mot répété cent fois ne vaut pas cent mentions
+        scores = {}
+        for (token, field), count in counts.items():
+            scores[token] = scores.get(token, 0.0) + (
+                FULLTEXT_FIELD_WEIGHTS[field] * (1 + math.log(count))
+            )
+        return scores
+
+    def _estimate_memory(self):
+        total = sys.getsizeof(self.postings) + sys.getsizeof(self.terms)
+        total += sys.getsizeof(self.keys)
+        for token, (docs, scores) in self.postings.items():
+            total += sys.getsizeof(token) + sys.getsizeof(docs) + sys.getsizeof(scores) + 56
+        return total
+
+    def _term_scores(self, term):
+        # Préfixe : tous les termes de l'index commençant par `term`, le terme
+        # exact comptant double ; pondéré par la rareté (idf).
+        scores = {}
+        count = len(self.keys)
+        i = bisect_left(self.terms, term)
+        end = min(i + FULLTEXT_MAX_EXPANSIONS, len(self.terms))
+        while i < end and self.terms[i].startswith(term):
+            token = self.terms[i]
+            docs, weights = self.postings[token]
+            idf = math.log(1 + count / len(docs))
+            boost = 2.0 if token == term else 1.0
+            for doc, weight in zip(docs, weights):
+                scores[doc] = max(scores.get(doc, 0.0), weight * idf * boost)
+            i += 1
+        return scores
+
+    def search(self, query, limit=FULLTEXT_MAX_HITS):
+        # Tous les termes doivent correspondre ; renvoie [(clé, score)] classés
+        terms = _WORD.findall(query.lower())
+        if not terms:
+            return []
+        scores = None
+        for term in terms:
+            term_scores = self._term_scores(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc: score + term_scores[doc]
+                    for doc, score in scores.items() if doc in term_scores
+                }
+            if not scores:
+                return []
+        best = heapq.nlargest(limit, scores.items(), key=lambda hit: hit[1])
+        return [(self.keys[doc], score) for doc, score in best]
+
+    def summary(self):
+        return (
+            f"{len(self.terms)} termes · {self.memory_bytes / 1e6:.1f} Mo · "
+            f"construit en {self.build_seconds:.2f} s"
+        )
+
+
+def fulltext_snippet(text, query, width=90):
+    # Extrait de la description autour du premier terme trouvé
+    if not isinstance(text, str):
+        return ""
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in _WORD.findall(query.lower())]
+    positions = [p for p in positions if p >= 0]
+    start = max(min(positions) - width // 3, 0) if positions else 0
+    snippet = " ".join(text[start:start + width].split())
+    return ("…" if start else "") + snippet + ("…" if start + width < len(text) else "")
+
+
+def format_result_count(count):
+    return f"{count} résultat{'s' if count > 1 else ''}"
+
+
+# --- RECHERCHE DIFFÉRÉE ---
+# Délai sans frappe avant de lancer la recherche
+SEARCH_DEBOUNCE_SECONDS = 0.15
+
+
+class Debouncer:
+    # Regroupe les appels rapprochés : seul le dernier est exécuté, dans un
+    # thread, après `delay` secondes sans nouvel appel. La tâche reçoit une
+    # fonction `is_current` qui devient fausse dès qu'un appel plus récent
+    # arrive, pour abandonner un résultat périmé avant de l'afficher.
+    def __init__(self, delay):
+        self.delay = delay
+        self.generation = 0
+        self._timer = None
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def submit(self, task):
+        with self._lock:
+            self.generation += 1
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._run, (self.generation, task))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        with self._lock:
+            self.generation += 1
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _run(self, generation, task):
+        # Les tâches s'exécutent une à une, dans l'ordre des appels
+        with self._run_lock:
+            if generation == self.generation:
+                task(lambda: generation == self.generation)
+
+
+# --- CACHE DES VUES ---
+# Nombre de vues détaillées conservées (composant, thème, favori)
+DETAIL_VIEW_CACHE_SIZE = 32
+
+
+class LRUCache:
+    # Cache borné : l'entrée la moins récemment utilisée est évincée en premier.
+    # `on_evict(clé, valeur)` est appelé pour chaque entrée retirée du cache.
+    def __init__(self, maxsize, on_evict=None):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        evicted = []
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False))
+        self._evicted(evicted)
+
+    def take(self, key, default=None):
+        # Retire l'entrée sans appeler `on_evict` : la valeur reste utilisée
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data.pop(key)
+        self._evicted([(key, value)])
+        return value
+
+    def clear(self):
+        with self._lock:
+            evicted = list(self._data.items())
+            self._data.clear()
+        self._evicted(evicted)
+
+    def _evicted(self, items):
+        if self.on_evict:
+            for key, value in items:
+                self.on_evict(key, value)
+
+
+# --- PRÉCHARGEMENT DES VUES ---
+# Voisins préconstruits de part et d'autre du composant affiché
+PREFETCH_NEIGHBOURS = 2
+# Premiers favoris préconstruits
+PREFETCH_FAVORITES = 3
+# Vues préconstruites en attente d'affichage (au-delà, les plus anciennes
+# sont abandonnées)
+PREFETCH_VIEW_CACHE_SIZE = 8
+# Délai après un affichage avant de précharger : une rafale de sélections
+# ne préconstruit que les voisins de la dernière
+PREFETCH_DELAY = 0.05
+
+
+class PrefetchStats:
+    # Vues affichées depuis le préchargement (hits) ou construites à froid
+    # (misses), vues préconstruites et vues abandonnées sans être affichées
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+        self.wasted = 0
+
+    @property
+    def hit_rate(self):
+        shown = self.hits + self.misses
+        return self.hits / shown if shown else None
+
+    def summary(self):
+        rate = self.hit_rate
+        return (
+            f"Préchargement {'-' if rate is None else f'{rate:.0%}'} "
+            f"({self.hits}/{self.hits + self.misses} vues, "
+            f"{self.built} préconstruites, {self.wasted} abandonnées)"
+        )
+
+
+# --- DÉCODEURS JSON ---
+def select_json_backend(preferred=None):
+    # Ordre de préférence : orjson, simdjson, puis la bibliothèque standard.
+    # La variable d'environnement JSON_DOCS_BACKEND force un choix.
+    backends = {'json': json.loads}
+    if simdjson is not None:
+        backends['simdjson'] = simdjson.loads
+    if orjson is not None:
+        backends['orjson'] = orjson.loads
+    if preferred in backends:
+        return preferred, backends[preferred]
+    for name in ('orjson', 'simdjson', 'json'):
+        if name in backends:
+            return name, backends[name]
+
+
+JSON_BACKEND, _backend_loads = select_json_backend(os.environ.get('JSON_DOCS_BACKEND'))
+# En mode paresseux, le balayage d'index (LazyCatalog) reste la règle : sa
+# mémoire ne dépend pas de la taille du fichier, il a des instantanés et des
+# empreintes sans décodage. simdjson y décode seulement chaque composant
+# (decode_json) ; son document complet (SimdjsonCatalog) n'est utilisé que
+# si JSON_DOCS_BACKEND=simdjson le demande explicitement.
+LAZY_BACKEND = (
+    'simdjson'
+    if simdjson is not None and os.environ.get('JSON_DOCS_BACKEND') == 'simdjson'
+    else 'index'
+)
+
+
+def decode_json(data):
+    try:
+        return _backend_loads(data)
+    except ValueError:
+        if _backend_loads is json.loads:
+            raise
+        # Cas limites refusés par certains décodeurs (BOM, NaN, entiers > 64 bits)
+        return json.loads(data)
+
+
+# --- PROGRESSION DU CHARGEMENT ---
+# Taille des blocs lus depuis le disque
+LOAD_CHUNK_SIZE = 4 * 1024 * 1024
+# Intervalle minimal entre deux rafraîchissements de la barre de progression
+LOAD_PROGRESS_INTERVAL = 0.1
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+class LoadProgress:
+    # Suit l'avancement d'un chargement : octets traités, phase en cours et
+    # durée de chaque phase, pour distinguer la lecture disque du décodage.
+    def __init__(self, total, callback=None, cancel=None):
+        self.total = total
+        self.done = 0
+        self.phase = None
+        self.timings = {}
+        self.started = time.perf_counter()
+        self._phase_started = self.started
+        self._callback = callback
+        self._cancel = cancel
+        self._last_report = 0.0
+        self.elapsed = None
+        self.backend = None
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else None
+
+    @property
+    def throughput(self):
+        # Débit de la phase en cours, en Mo/s
+        elapsed = time.perf_counter() - self._phase_started
+        return self.done / 1e6 / elapsed if elapsed > 0 else 0.0
+
+    def check_cancelled(self):
+        if self._cancel is not None and self._cancel.is_set():
+            raise LoadCancelled()
+
+    def start_phase(self, phase):
+        self._end_phase()
+        self.phase = phase
+        self.done = 0
+        self._report(force=True)
+
+    def advance(self, done):
+        self.check_cancelled()
+        self.done = done
+        self._report()
+
+    def finish(self):
+        self._end_phase()
+        self.phase = None
+        self.elapsed = time.perf_counter() - self.started
+
+    def _end_phase(self):
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.timings[self.phase] = (now - self._phase_started, self.done)
+        self._phase_started = now
+
+    def _report(self, force=False):
+        now = time.perf_counter()
+        if self._callback and (force or now - self._last_report >= LOAD_PROGRESS_INTERVAL):
+            self._last_report = now
+            self._callback(self)
+
+    def summary(self):
+        # Ex. « orjson · Lecture 412.0 Mo/s · Analyse 1.32 s · total 1.41 s »
+        parts = [self.backend] if self.backend else []
+        for phase, (seconds, done) in self.timings.items():
+            if done and seconds > 0:
+                parts.append(f"{phase} {done / 1e6 / seconds:.1f} Mo/s")
+            else:
+                parts.append(f"{phase} {seconds:.2f} s")
+        if self.elapsed is not None:
+            parts.append(f"total {self.elapsed:.2f} s")
+        return " · ".join(parts)
+
+
+# --- CHARGEMENT PARESSEUX ---
+# Au-delà de cette taille, le fichier est indexé puis décodé composant par
+# composant au lieu d'être chargé d'un bloc.
+LAZY_LOAD_THRESHOLD = 64 * 1024 * 1024
+# Nombre de composants décodés gardés en mémoire en mode paresseux
+LAZY_ENTRY_CACHE_SIZE = 64
+
+_JSON_OPEN = re.compile(rb'(?:\xef\xbb\xbf)?\s*\{\s*')
+_JSON_KEY = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")\s*:\s*')
+_JSON_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_JSON_SCALAR = re.compile(rb'[^,}\]\s]+')
+# Saute d'un bloc le texte et les chaînes jusqu'au prochain crochet/accolade
+_JSON_NESTED = re.compile(rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*([{}\[\]])')
+_JSON_SEPARATOR = re.compile(rb'\s*([,}])\s*')
+
+
+def _skip_json_value(buf, pos):
+    # Renvoie la position qui suit la valeur commençant à `pos`, sans la décoder
+    first = buf[pos:pos + 1]
+    if first in (b'{', b'['):
+        depth = 0
+        for m in _JSON_NESTED.finditer(buf, pos):
+            if m.group(1) in (b'{', b'['):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return m.end()
+        raise ValueError("JSON tronqué")
+    m = (_JSON_STRING if first == b'"' else _JSON_SCALAR).match(buf, pos)
+    if not m:
+        raise ValueError(f"Valeur JSON invalide à l'octet {pos}")
+    return m.end()
+
+
+def index_json_object(buf, progress=None):
+    # Parcourt l'objet racine une seule fois et renvoie {clé: (début, fin)}
+    # pour chaque valeur de premier niveau.
+    m = _JSON_OPEN.match(buf)
+    if not m:
+        raise ValueError("Le fichier doit contenir un objet JSON")
+    offsets = {}
+    pos = m.end()
+    if buf[pos:pos + 1] == b'}':
+        return offsets
+    while True:
+        m = _JSON_KEY.match(buf, pos)
+        if not m:
+            raise ValueError(f"Clé JSON attendue à l'octet {pos}")
+        start = m.end()
+        end = _skip_json_value(buf, start)
+        offsets[json.loads(m.group(1))] = (start, end)
+        m = _JSON_SEPARATOR.match(buf, end)
+        if not m:
+            raise ValueError(f"',' ou '}}' attendu à l'octet {end}")
+        pos = m.end()
+        if m.group(1) == b'}':
+            return offsets
+        if progress is not None and len(offsets) % 256 == 0:
+            progress.advance(pos)
+
+
+class CatalogChanged(ValueError):
+    # Le fichier d'un catalogue paresseux a changé sur disque : ses positions
+    # ne sont plus valides, les lectures sont refusées jusqu'au rechargement.
+    pass
+
+
+def _fd_signature(fd):
+    stat = os.fstat(fd)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class LazyCatalog(Mapping):
+    # Catalogue adossé au fichier : seules les positions des clés sont
+    # conservées, chaque composant est lu puis décodé à la demande. Aucune
+    # projection mmap n'est gardée après l'indexation : lire une page d'un
+    # fichier tronqué entre-temps tue le processus (SIGBUS), alors qu'une
+    # lecture classique se vérifie et échoue proprement (CatalogChanged).
+    def __init__(self, path, progress=None, offsets=None, signature=None):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._lock = threading.Lock()  # Sans os.pread : seek + read
+        try:
+            fd = self._file.fileno()
+            self.signature = signature or _fd_signature(fd)
+            if offsets is None:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as buf:
+                    offsets = index_json_object(buf, progress)
+                if _fd_signature(fd) != self.signature:
+                    raise CatalogChanged(f"{path} a changé pendant l'indexation")
+            self.offsets = offsets
+        except Exception:
+            self.close()
+            raise
+        self._entries = LRUCache(LAZY_ENTRY_CACHE_SIZE)
+
+    def _read(self, start, end):
+        fd = self._file.fileno()
+        if _fd_signature(fd) != self.signature:
+            raise CatalogChanged(f"{self.path} a changé sur disque")
+        if hasattr(os, 'pread'):
+            data = os.pread(fd, end - start, start)
+        else:
+            with self._lock:
+                self._file.seek(start)
+                data = self._file.read(end - start)
+        if len(data) != end - start:
+            raise CatalogChanged(f"{self.path} a été tronqué")
+        return data
+
+    def __contains__(self, key):
+        return key in self.offsets  # Sans décoder le composant
+
+    def __getitem__(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = ComponentDoc.from_json(decode_json(self._read(*self.offsets[key])))
+            self._entries.put(key, entry)
+        return entry
+
+    def __iter__(self):
+        return iter(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def fingerprint(self, key):
+        # Empreinte du texte brut du composant, sans le décoder
+        start, end = self.offsets[key]
+        return (end - start, zlib.crc32(self._read(start, end)))
+
+    def close(self):
+        self._file.close()
+
+
+class SimdjsonCatalog(Mapping):
+    # Variante paresseuse adossée à simdjson : le document est validé une fois
+    # en C (bien plus vite que le balayage d'index), puis chaque composant
+    # n'est converti en objets Python qu'à la demande. En contrepartie, le
+    # contenu du fichier et la représentation interne de simdjson restent en
+    # mémoire (copiés : une réécriture du fichier ne les touche pas).
+    def __init__(self, path, progress=None):
+        self.path = path
+        self._lock = threading.Lock()
+        with open(path, 'rb') as f:
+            self._data = f.read()
+        self._parser = simdjson.Parser()
+        self._document = self._parser.parse(self._data)
+        if not isinstance(self._document, simdjson.Object):
+            self.close()
+            raise ValueError("Le fichier doit contenir un objet JSON")
+        self._keys = list(self._document.keys())
+        if progress is not None:
+            progress.advance(len(self._data))
+        self._entries = LRUCache(LAZY_ENTRY_CACHE_SIZE)
+
+    def __getitem__(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            # Les objets simdjson ne sont pas sûrs entre threads
+            with self._lock:
+                value = self._document[key]
+                if isinstance(value, simdjson.Object):
+                    value = value.as_dict()
+            entry = ComponentDoc.from_json(value)
+            self._entries.put(key, entry)
+        return entry
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def close(self):
+        self._document = None
+        self._parser = None
+        self._data = None
+
+
+def close_catalog(catalog):
+    # Libère le fichier ouvert des catalogues paresseux
+    if isinstance(catalog, (LazyCatalog, SimdjsonCatalog, WorkspaceCatalog)):
+        catalog.close()
+
+
+# --- ESPACE DE TRAVAIL ---
+# Les clés d'un espace de travail sont préfixées par le nom du fichier
+WORKSPACE_SEPARATOR = '/'
+# En dessous de ce volume à indexer, un pool de processus coûte plus qu'il
+# ne rapporte : l'indexation se fait dans le thread de chargement.
+WORKSPACE_POOL_THRESHOLD = 8 * 1024 * 1024
+# Erreurs d'une plateforme sans pool de processus, ou d'un pool dont un
+# processus a disparu (tué, mémoire épuisée) : repli en série
+POOL_ERRORS = (ImportError, OSError, NotImplementedError, BrokenProcessPool)
+
+
+def _process_pool(workers):
+    # Jamais de fork du processus courant, qui a déjà des threads (interface,
+    # chargement) : un enfant pourrait hériter d'un verrou pris à jamais.
+    # forkserver part d'un processus neuf ; spawn là où il n'existe pas.
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+class WorkspaceCatalog(Mapping):
+    # Plusieurs fichiers vus comme un seul catalogue, clés « fichier/Composant ».
+    # Chaque fichier est un LazyCatalog : un composant n'est décodé qu'à
+    # sa première consultation.
+    def __init__(self, path, catalogs):
+        self.path = path
+        self.catalogs = catalogs  # Espace de noms -> catalogue
+        self._len = sum(len(catalog) for catalog in catalogs.values())
+
+    def _locate(self, key):
+        namespace, sep, inner = key.partition(WORKSPACE_SEPARATOR)
+        catalog = self.catalogs.get(namespace) if sep else None
+        return catalog, inner
+
+    def __contains__(self, key):
+        catalog, inner = self._locate(key)
+        return catalog is not None and inner in catalog
+
+    def __getitem__(self, key):
+        catalog, inner = self._locate(key)
+        if catalog is None:
+            raise KeyError(key)
+        return catalog[inner]
+
+    def __iter__(self):
+        for namespace, catalog in self.catalogs.items():
+            for key in catalog:
+                yield f"{namespace}{WORKSPACE_SEPARATOR}{key}"
+
+    def __len__(self):
+        return self._len
+
+    def close(self):
+        for catalog in self.catalogs.values():
+            catalog.close()
+
+
+def workspace_files(paths):
+    # Un dossier apporte ses fichiers .json (sans descendre dans les
+    # sous-dossiers) ; renvoie (racine, fichiers).
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith('.json')
+            )
+        else:
+            files.append(path)
+    if not files:
+        raise ValueError("Aucun fichier JSON dans la sélection")
+    root = paths[0] if len(paths) == 1 else os.path.commonpath([os.path.abspath(p) for p in files])
+    return root, files
+
+
+def _index_file(path):
+    # Exécuté dans un processus du pool : seules les positions des clés
+    # reviennent au processus principal, pas les composants décodés.
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return index_json_object(buf)
+
+
+def _index_files(paths, workers):
+    # Produit (chemin, positions) au fil des fichiers terminés
+    if workers <= 1:
+        for path in paths:
+            yield path, _index_file(path)
+        return
+    executor = None
+    remaining = list(paths)
+    try:
+        executor = _process_pool(workers)
+        futures = {executor.submit(_index_file, path): path for path in paths}
+        for future in as_completed(futures):
+            path, positions = futures[future], future.result()
+            remaining.remove(path)
+            yield path, positions
+        return
+    except POOL_ERRORS:
+        # Pas de processus possibles (Android sans sem_open, exécutable
+        # figé) ou pool interrompu : le reste en série, dans ce thread
+        pass
+    finally:
+        # Annulation : les fichiers pas encore commencés sont abandonnés
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    yield from _index_files(remaining, 1)
+
+
+def load_workspace(paths, progress=None):
+    # Indexe les fichiers en parallèle (un processus par cœur), en
+    # réutilisant les instantanés valides, puis fusionne les catalogues.
+    root, files = workspace_files(paths)
+    signatures = {path: file_signature(path) for path in files}
+    total = sum(signature[1] for signature in signatures.values())
+    if progress is None:
+        progress = LoadProgress(total)
+    progress.total = total
+    progress.start_phase("Indexation")
+    
+    offsets = {}
+    done = 0
+    pending = []
+    for path in files:
+        cached = read_snapshot(path, signatures[path], 'lazy')
+        if cached is None:
+            pending.append(path)
+        else:
+            offsets[path] = cached
+            done += signatures[path][1]
+    progress.advance(done)
+    
+    pending_size = sum(signatures[path][1] for path in pending)
+    workers = 1
+    if len(pending) > 1 and pending_size >= WORKSPACE_POOL_THRESHOLD:
+        workers = min(len(pending), os.cpu_count() or 1)
+    progress.backend = f"{JSON_BACKEND} (index, {workers} processus)"
+    with closing(_index_files(pending, workers)) as results:
+        for path, file_offsets in results:
+            offsets[path] = file_offsets
+            done += signatures[path][1]
+            progress.advance(done)
+    
+    catalogs = {}
+    try:
+        for path in files:
+            namespace = os.path.splitext(os.path.basename(path))[0]
+            while namespace in catalogs:
+                namespace += "~"  # Même nom de fichier dans deux dossiers
+            catalogs[namespace] = LazyCatalog(path, offsets=offsets[path], signature=signatures[path])
+    except Exception:
+        for catalog in catalogs.values():
+            catalog.close()
+        raise
+    
+    by_path = {catalog.path: catalog for catalog in catalogs.values()}
+    
+    def save_snapshots():
+        for path in pending:
+            write_snapshot(path, signatures[path], by_path[path])
+    
+    threading.Thread(target=save_snapshots, daemon=True).start()
+    progress.finish()
+    return WorkspaceCatalog(root, catalogs)
+
+
+# --- INSTANTANÉS SUR DISQUE ---
+# Un instantané par fichier ouvert, valide tant que sa date de modification
+# et sa taille n'ont pas changé.
+SNAPSHOT_DIR = '.docs_cache'
+SNAPSHOT_VERSION = 2
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def snapshot_path(path, kind):
+    # Un fichier ouvert seul (complet) puis dans un espace de travail
+    # (indexé) a deux instantanés, qui ne s'écrasent pas l'un l'autre
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(SNAPSHOT_DIR, f"{digest}-{kind}.snap")
+
+
+def _snapshot_header(signature):
+    # marshal dépend de la version de Python : elle fait partie de l'en-tête
+    return (SNAPSHOT_VERSION, tuple(sys.version_info[:2]), tuple(signature))
+
+
+def _catalog_kind(size):
+    return 'lazy' if size >= LAZY_LOAD_THRESHOLD else 'full'
+
+
+def read_snapshot(path, signature, expected_kind=None):
+    # Renvoie le contenu de l'instantané s'il correspond encore au fichier
+    # (et au mode de chargement attendu, déduit de la taille par défaut).
+    # marshal.loads sur le contenu complet : marshal.load lit le fichier
+    # objet par objet et s'avère bien plus lent.
+    expected = expected_kind or _catalog_kind(signature[1])
+    try:
+        with open(snapshot_path(path, expected), 'rb') as f:
+            header, kind, payload = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if header != _snapshot_header(signature) or kind != expected:
+        return None
+    return payload
+
+
+def write_snapshot(path, signature, catalog):
+    # Écrit l'instantané avec les clés déjà triées, ce qui rend linéaire le
+    # tri de SearchIndex au prochain chargement.
+    if isinstance(catalog, LazyCatalog):
+        kind, source = 'lazy', catalog.offsets
+    elif isinstance(catalog, dict):
+        kind, source = 'full', {key: doc.state() for key, doc in catalog.items()}
+    else:
+        return  # Pas de positions à conserver (simdjson) : rien à écrire
+    payload = {key: source[key] for key in sorted(source)}
+    target = snapshot_path(path, kind)
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(target + '.tmp', 'wb') as f:
+            f.write(marshal.dumps((_snapshot_header(signature), kind, payload)))
+        os.replace(target + '.tmp', target)
+    except (OSError, ValueError):
+        pass
+
+
+def load_catalog(path, progress=None, use_snapshot=True):
+    # Instantané valide : aucun décodage JSON. Sinon, petits fichiers : lecture
+    # par blocs puis décodage complet ; gros fichiers : index des clés.
+    # Lève LoadCancelled si le chargement est annulé via `progress`.
+    signature = file_signature(path)
+    size = signature[1]
+    if progress is None:
+        progress = LoadProgress(size)
+    
+    if use_snapshot:
+        progress.start_phase("Instantané")
+        cached = read_snapshot(path, signature)
+        if cached is not None:
+            if _catalog_kind(size) == 'lazy':
+                catalog = LazyCatalog(path, offsets=cached, signature=signature)
+            else:
+                catalog = {key: ComponentDoc.from_state(state) for key, state in cached.items()}
+            progress.finish()
+            return catalog
+        progress.phase = None  # Pas d'instantané valide : rien à mesurer
+    
+    catalog = _parse_catalog(path, signature, progress)
+    if use_snapshot:
+        threading.Thread(
+            target=write_snapshot,
+            args=(path, signature, catalog),
+            daemon=True
+        ).start()
+    return catalog
+
+
+def _parse_catalog(path, signature, progress):
+    if _catalog_kind(signature[1]) == 'lazy':
+        progress.start_phase("Indexation")
+        if LAZY_BACKEND == 'simdjson':
+            progress.backend = "simdjson (à la demande)"
+            catalog = SimdjsonCatalog(path, progress)
+        else:
+            progress.backend = f"{JSON_BACKEND} (index)"
+            catalog = LazyCatalog(path, progress, signature=signature)
+        progress.finish()
+        return catalog
+    
+    progress.start_phase("Lecture")
+    chunks = []
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(LOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            progress.advance(progress.done + len(chunk))
+    
+    progress.start_phase("Analyse")
+    progress.backend = JSON_BACKEND
+    data = compact_catalog(decode_json(b''.join(chunks)))
+    progress.check_cancelled()
+    progress.finish()
+    return data
+
+
+# --- SURVEILLANCE DU FICHIER ---
+# Intervalle de scrutation du fichier ouvert, en secondes
+WATCH_INTERVAL = 1.0
+
+
+class FileWatcher:
+    # Scrute la date de modification et la taille du fichier dans un thread.
+    # Un changement n'est signalé qu'une fois la signature stable sur deux
+    # scrutations, pour ne pas relire un fichier en cours d'écriture.
+    # `signature(path)` peut couvrir plusieurs fichiers (espace de travail).
+    def __init__(self, path, on_change, interval=WATCH_INTERVAL, signature=file_signature):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._signature = signature
+        self.signature = signature(path)
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            try:
+                signature = self._signature(self.path)
+            except (OSError, ValueError):
+                continue  # Fichier en cours de remplacement, dossier vidé
+            if signature == self.signature:
+                pending = None
+            elif signature != pending:
+                pending = signature
+            else:
+                self.signature, pending = signature, None
+                if not self._stop.is_set():
+                    self.on_change(self.path)
+
+    def stop(self):
+        self._stop.set()
+
+
+def catalog_fingerprints(catalog):
+    # Clé -> valeur comparable d'un chargement à l'autre. Les catalogues en
+    # mémoire sont leur propre empreinte ; le catalogue indexé n'empreinte
+    # que les octets bruts, sans décoder les composants.
+    if isinstance(catalog, LazyCatalog):
+        return {key: catalog.fingerprint(key) for key in catalog.offsets}
+    return catalog
+
+
+def diff_catalogs(old, new):
+    # Renvoie (ajoutées, supprimées, modifiées) au niveau des composants
+    old_keys = old.keys()
+    new_keys = new.keys()
+    added = [key for key in new_keys if key not in old]
+    removed = [key for key in old_keys if key not in new]
+    changed = [key for key in new_keys if key in old and old[key] != new[key]]
+    return added, removed, changed
+
+
+# --- FAVORIS ---
+# Fichier historique, commun à tous les fichiers de documentation
+FAVORITES_LEGACY_FILE = 'favorites.json'
+FAVORITES_DIR = '.favorites'
+# Délai avant l'écriture sur disque : une rafale de clics = une écriture
+FAVORITES_SAVE_DELAY = 0.5
+
+
+def favorites_path(docs_path):
+    # Un fichier de favoris par fichier de documentation
+    digest = hashlib.sha1(os.path.abspath(docs_path).encode('utf-8')).hexdigest()
+    return os.path.join(FAVORITES_DIR, f"{digest[:16]}.json")
+
+
+class FavoritesStore:
+    # Ensemble ordonné (dict) : appartenance en O(1), ordre d'ajout conservé
+    # dans le fichier. Les écritures sont différées dans un thread et
+    # atomiques (fichier temporaire puis renommage).
+    def __init__(self, delay=FAVORITES_SAVE_DELAY):
+        self.path = None
+        self._keys = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._saver = Debouncer(delay)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def open(self, path):
+        # Enregistre les changements en attente puis charge `path` ; un
+        # fichier absent reprend les favoris de l'ancien fichier commun.
+        self.flush()
+        keys = self._read(path)
+        if keys is None:
+            keys = self._read(FAVORITES_LEGACY_FILE) or []
+        with self._lock:
+            self.path = path
+            self._keys = dict.fromkeys(keys)
+
+    def _read(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                keys = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return [k for k in keys if isinstance(k, str)] if isinstance(keys, list) else None
+
+    def _write(self, path, keys):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(keys, f)
+        os.replace(path + '.tmp', path)
+
+    def toggle(self, key):
+        # Renvoie True si la clé est désormais favorite
+        with self._lock:
+            added = key not in self._keys
+            if added:
+                self._keys[key] = None
+            else:
+                del self._keys[key]
+            self._dirty = True
+        self._saver.submit(lambda is_current: self.flush())
+        return added
+
+    def flush(self):
+        # Écrit immédiatement les changements en attente
+        with self._lock:
+            if not self._dirty or self.path is None:
+                return
+            path, keys = self.path, list(self._keys)
+            self._dirty = False
+        try:
+            self._write(path, keys)
+        except Exception:
+            logger.warning("Impossible d'enregistrer les favoris dans %s", path)
+
+
+class ClientFavoritesStore(FavoritesStore):
+    # Mode serveur : les favoris restent chez chaque utilisateur (stockage du
+    # navigateur), le chemin ne sert que de nom de clé. La lecture est un
+    # aller-retour avec le client : `open` ne l'attend pas, `on_loaded()` est
+    # appelé quand les favoris sont arrivés.
+    def __init__(self, page, delay=FAVORITES_SAVE_DELAY):
+        super().__init__(delay)
+        self.page = page
+        self.on_loaded = None
+
+    def open(self, path):
+        self.flush()
+        with self._lock:
+            self.path = path
+            self._keys = {}
+        threading.Thread(target=self._load, args=(path,), daemon=True).start()
+
+    def _load(self, path):
+        keys = self._read(path) or []
+        with self._lock:
+            if self.path != path:
+                return  # Un autre fichier a été ouvert entre-temps
+            # Les favoris ajoutés pendant la lecture sont conservés
+            self._keys = {**dict.fromkeys(keys), **self._keys}
+        if keys and self.on_loaded:
+            self.on_loaded()
+
+    def _read(self, path):
+        try:
+            keys = self.page.client_storage.get(path)
+        except Exception:
+            return None
+        return [k for k in keys if isinstance(k, str)] if isinstance(keys, list) else None
+
+    def _write(self, path, keys):
+        self.page.client_storage.set(path, keys)
+
+
+# --- CATALOGUES PARTAGÉS ---
+# Un fichier ouvert par plusieurs sessions n'est chargé qu'une fois par
+# processus. Le catalogue, ses index et les descriptions analysées ne sont
+# jamais modifiés après publication : les sessions les lisent sans copie ni
+# verrou et ne gardent que leur sélection, leurs recherches et leurs favoris.
+def open_catalog(paths, progress):
+    # Un fichier seul ou un espace de travail ; renvoie (catalogue, chemin)
+    if len(paths) == 1 and os.path.isfile(paths[0]):
+        progress.total = os.path.getsize(paths[0])
+        return load_catalog(paths[0], progress), paths[0]
+    catalog = load_workspace(paths, progress)
+    return catalog, catalog.path
+
+
+class SharedCatalog:
+    def __init__(self, key):
+        self.key = key
+        self.catalog = None
+        self.path = None  # Fichier ou racine de l'espace de travail
+        self.search_index = None
+        self.fulltext_index = None  # Construit en arrière-plan après le chargement
+        self.progress = None  # Mesures du chargement
+        self.descriptions = {}  # Clé -> DescriptionInfo (immuable)
+        self.users = 0
+        self.error = None
+        self.ready = threading.Event()
+        self._fingerprints = None
+        self._listeners = []
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+
+    def describe(self, key):
+        # Deux sessions peuvent calculer la même entrée : la première gagne
+        info = self.descriptions.get(key)
+        if info is None:
+            info = self.descriptions.setdefault(key, DescriptionInfo(self.catalog[key].description))
+        return info
+
+    def fingerprints(self):
+        with self._lock:
+            if self._fingerprints is None:
+                self._fingerprints = catalog_fingerprints(self.catalog)
+            return self._fingerprints
+
+    def on_fulltext(self, callback):
+        # callback(index) dès que l'index plein texte est disponible
+        with self._lock:
+            if self.fulltext_index is None:
+                self._listeners.append(callback)
+                return
+        callback(self.fulltext_index)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def build_fulltext(self):
+        try:
+            index = FullTextIndex(self.catalog, self._closed)
+        except Exception:
+            return  # Fermé avant la fin de la construction
+        logger.info("Index plein texte : %s", index.summary())
+        with self._lock:
+            self.fulltext_index = index
+            listeners, self._listeners = self._listeners, []
+        for callback in listeners:
+            callback(index)
+
+    def close(self):
+        self._closed.set()
+        close_catalog(self.catalog)
+
+
+class CatalogStore:
+    # Catalogues du processus, indexés par chemins et signatures : un fichier
+    # modifié sur disque donne une nouvelle entrée. Compteur d'utilisateurs :
+    # le dernier à libérer une entrée la ferme.
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(paths):
+        if len(paths) == 1 and os.path.isfile(paths[0]):
+            kind, files = 'file', paths
+        else:
+            kind, files = 'workspace', workspace_files(paths)[1]
+        return kind, tuple((os.path.abspath(path), file_signature(path)) for path in files)
+
+    def acquire(self, paths, progress=None):
+        # Renvoie l'entrée chargée, en la chargeant si aucune session ne l'a
+        # déjà fait. Lève LoadCancelled si `progress` est annulé.
+        progress = progress or LoadProgress(0)
+        key = self._key(paths)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                loader = entry is None
+                if loader:
+                    entry = self._entries[key] = SharedCatalog(key)
+                entry.users += 1
+            if loader:
+                self._load(entry, paths, progress)
+                return entry
+            # Une autre session charge ce fichier : on attend son résultat
+            while not entry.ready.wait(0.05):
+                try:
+                    progress.check_cancelled()
+                except LoadCancelled:
+                    self.release(entry)
+                    raise
+            if entry.error is None:
+                return entry
+            self.release(entry)
+            if not isinstance(entry.error, LoadCancelled):
+                raise entry.error
+            # Le chargement a été annulé par sa session : on le reprend
+
+    def _load(self, entry, paths, progress):
+        try:
+            entry.catalog, entry.path = open_catalog(paths, progress)
+            entry.search_index = SearchIndex(entry.catalog.keys())
+            entry.progress = progress
+        except BaseException as ex:
+            entry.error = ex
+            with self._lock:
+                if self._entries.get(entry.key) is entry:
+                    del self._entries[entry.key]
+            entry.ready.set()
+            raise
+        entry.ready.set()
+        threading.Thread(target=entry.build_fulltext, daemon=True).start()
+
+    def release(self, entry):
+        with self._lock:
+            entry.users -= 1
+            if entry.users > 0:
+                return
+            if self._entries.get(entry.key) is entry:
+                del self._entries[entry.key]
+        entry.close()
+
+    def evict(self, paths):
+        # La prochaine ouverture de `paths` relira le fichier ; les sessions
+        # qui l'affichent gardent l'entrée actuelle jusqu'à sa libération.
+        key = self._key(paths)
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        # [(chemin, sessions, composants)] des catalogues en mémoire
+        with self._lock:
+            entries = list(self._entries.values())
+        return [
+            (entry.path, entry.users, len(entry.catalog))
+            for entry in entries if entry.catalog is not None
+        ]
+
+
+catalog_store = CatalogStore()
+
+
+class ServerCatalog:
+    # Mode serveur : référence permanente sur la dernière version des
+    # fichiers servis, chargée même sans session. Quand ils changent sur
+    # disque, la nouvelle version est chargée une fois (et partagée avec les
+    # sessions qui l'ouvrent) puis remplace l'ancienne, libérée : celle-ci
+    # est fermée dès que sa dernière session la quitte.
+    def __init__(self, store, paths, interval=WATCH_INTERVAL):
+        self.store = store
+        self.paths = paths
+        self.entry = store.acquire(paths)
+        self._watcher = FileWatcher(paths, self._refresh, interval, store._key)
+
+    def _refresh(self, paths):
+        try:
+            entry = self.store.acquire(paths)
+        except Exception as ex:
+            logger.warning("Rechargement de %s impossible : %s", paths, ex)
+            return
+        old, self.entry = self.entry, entry
+        self.store.release(old)
+
+    def close(self):
+        self._watcher.stop()
+        self.store.release(self.entry)
+
+
+# --- MODE SERVEUR ---
+# python main.py --server docs.json : chaque session ouvre ces fichiers,
+# chargés une seule fois par version (ServerCatalog), sans sélecteur de fichier.
+SERVER_DOCS = []
+# Vues détaillées gardées par session en mode serveur (32 en local)
+SERVER_DETAIL_VIEW_CACHE_SIZE = 4
+# Vues préconstruites par session en mode serveur (8 en local)
+SERVER_PREFETCH_VIEW_CACHE_SIZE = 2
+
+
+# --- EXPORT HTML STATIQUE ---
+# python main.py --export site/ docs.json : une page par composant plus un
+# index. Les pages dont le contenu n'a pas changé depuis le dernier export
+# (empreinte dans le manifeste) ne sont pas régénérées.
+EXPORT_MANIFEST = '.export_manifest.json'
+# Change à chaque modification du gabarit : toutes les pages sont refaites
+EXPORT_VERSION = 3
+# Pages rendues par tâche envoyée au pool de processus
+EXPORT_BATCH_SIZE = 256
+# En dessous de ce nombre de pages à rendre, le pool coûte plus qu'il ne rapporte
+EXPORT_POOL_THRESHOLD = 500
+
+EXPORT_STYLE = """
+body {{ font-family: system-ui, sans-serif; background: {bg}; color: {text}; max-width: 960px; margin: 0 auto; padding: 24px; }}
+a {{ color: {primary}; }}
+.kind {{ color: {accent}; font-weight: 600; font-size: 13px; }}
+pre {{ background: {codebg}; padding: 12px; border-radius: 8px; overflow-x: auto; }}
+table {{ border-collapse: collapse; width: 100%; background: {card}; }}
+th, td {{ border-bottom: 1px solid {border}; padding: 8px 12px; text-align: left; vertical-align: top; }}
+.type {{ color: {accent}; font-weight: 600; }}
+.muted {{ color: {subtext}; }}
+.req {{ background: #FF3B30; color: #FFFFFF; font-size: 10px; font-weight: 800; padding: 2px 6px; border-radius: 4px; }}
+""".format(**COLORS['light'])
+
+
+@functools.lru_cache(maxsize=None)
+def _markdown_renderer():
+    # Un par processus du pool. Sans html_block ni html, le HTML brut des
+    # descriptions (« Map<String, int> », <script>) est échappé comme du
+    # texte, comme dans le rendu de repli ; les blocs de code ne changent pas.
+    renderer = markdown.Markdown(extensions=['fenced_code', 'tables'])
+    renderer.preprocessors.deregister('html_block')
+    renderer.inlinePatterns.deregister('html')
+    return renderer
+
+
+def markdown_to_html(text):
+    if markdown is not None:
+        return _markdown_renderer().reset().convert(text)
+    # Sans la bibliothèque markdown : blocs de code et paragraphes seulement
+    parts = []
+    for i, chunk in enumerate(re.split(r'```[\w+-]*\n?([\s\S]*?)```', text)):
+        if i % 2:
+            parts.append(f"<pre><code>{html.escape(chunk.strip())}</code></pre>")
+        else:
+            parts.extend(
+                f"<p>{html.escape(paragraph.strip())}</p>"
+                for paragraph in chunk.split('\n\n') if paragraph.strip()
+            )
+    return "\n".join(parts)
+
+
+def export_filenames(keys):
+    # Noms de fichier sûrs. Reçoivent un suffixe qui évite toute collision :
+    # les clés réécrites (ex. « fichier/Composant »), celles qui ne diffèrent
+    # que par la casse (Button et button sur macOS ou Windows) et « index »
+    slugs = {key: re.sub(r'[^\w.-]', '_', key) for key in keys}
+    seen = Counter(slug.lower() for slug in slugs.values())
+    seen['index'] += 1
+    names = {}
+    for key, slug in slugs.items():
+        if slug != key or seen[slug.lower()] > 1:
+            slug += '-' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+        names[key] = slug + '.html'
+    return names
+
+
+def export_hash(key, state):
+    # Empreinte du contenu rendu : composant, gabarit et moteur markdown
+    payload = json.dumps([EXPORT_VERSION, markdown is not None, key, state], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _html_page(title, body):
+    return (
+        f'<!DOCTYPE html>\n<html lang="fr"><head><meta charset="utf-8">'
+        f'<title>{html.escape(title)}</title><style>{EXPORT_STYLE}</style></head>'
+        f'<body>{body}</body></html>\n'
+    )
+
+
+def render_component_html(key, doc):
+    # Même contenu que la vue détaillée : description, propriétés et
+    # explications (celles de PROPERTY_DOCS à défaut de description)
+    rows = []
+    for i in range(len(doc)):
+        name, type_, default, required, explanation = doc.property(i)
+        rows.append(
+            f"<tr><td><strong>{html.escape(name)}</strong>"
+            f"{' <span class=req>REQ</span>' if required else ''}</td>"
+            f"<td class=type>{html.escape(type_)}</td>"
+            f"<td class=muted>{html.escape(default)}</td>"
+            f"<td>{html.escape(str(explanation)) if explanation is not None else ''}</td></tr>"
+        )
+    properties = (
+        "<table><tr><th>Nom</th><th>Type</th><th>Défaut</th><th>Explication</th></tr>"
+        + "".join(rows) + "</table>"
+        if rows else "<p class=muted><em>Aucune propriété.</em></p>"
+    )
+    return _html_page(key, (
+        f'<p><a href="index.html">← Index</a></p>'
+        f'<h1>{html.escape(key)}</h1><div class=kind>COMPONENT</div>'
+        f'<h2>Description</h2>{markdown_to_html(DescriptionInfo(doc.description).markdown)}'
+        f'<h2>Propriétés</h2>{properties}'
+    ))
+
+
+def _export_pages(directory, items):
+    # Exécuté dans un processus du pool : items = [(clé, fichier, état)]
+    for key, filename, state in items:
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            f.write(render_component_html(key, ComponentDoc.from_state(state)))
+    return len(items)
+
+
+def export_site(paths, directory, workers=None, progress=None):
+    # Rend le catalogue en HTML dans `directory` ; renvoie (pages rendues,
+    # pages inchangées, pages supprimées).
+    progress = progress or LoadProgress(0)
+    catalog, _ = open_catalog(paths, progress)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, EXPORT_MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = {}
+
+        keys = sorted(catalog)
+        filenames = export_filenames(keys)
+        manifest = {}
+        pending = []
+        for key in keys:
+            state = catalog[key].state()
+            filename = filenames[key]
+            manifest[key] = entry = [export_hash(key, state), filename]
+            if previous.get(key) != entry or not os.path.exists(os.path.join(directory, filename)):
+                pending.append((key, filename, state))
+    finally:
+        close_catalog(catalog)
+
+    progress.total = len(pending)
+    progress.start_phase("Export")
+    batches = [pending[i:i + EXPORT_BATCH_SIZE] for i in range(0, len(pending), EXPORT_BATCH_SIZE)]
+    workers = workers or os.cpu_count() or 1
+    done = 0
+    remaining = batches
+    progress.backend = "1 processus"
+    if len(pending) >= EXPORT_POOL_THRESHOLD and workers > 1:
+        exported = set()
+        executor = None
+        try:
+            executor = _process_pool(workers)
+            futures = {executor.submit(_export_pages, directory, batch): i for i, batch in enumerate(batches)}
+            progress.backend = f"{workers} processus"
+            for future in as_completed(futures):
+                done += future.result()
+                exported.add(futures[future])
+                progress.advance(done)
+        except POOL_ERRORS:
+            pass  # Même repli que _index_files : le reste en série
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        remaining = [batch for i, batch in enumerate(batches) if i not in exported]
+    for batch in remaining:
+        done += _export_pages(directory, batch)
+        progress.advance(done)
+
+    # Pages des clés disparues ou renommées ; jamais un nom encore utilisé,
+    # même à la casse près (système de fichiers insensible à la casse)
+    removed = [key for key in previous if key not in manifest]
+    current = {filename.lower() for filename in filenames.values()}
+    for entry in previous.values():
+        if not isinstance(entry, list) or entry[1].lower() in current:
+            continue  # Manifeste de la version 1 : nom de fichier inconnu
+        try:
+            os.remove(os.path.join(directory, entry[1]))
+        except OSError:
+            pass
+
+    links = "".join(
+        f'<li><a href="{html.escape(filenames[key])}">{html.escape(key)}</a></li>'
+        for key in keys
+    )
+    with open(os.path.join(directory, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(_html_page("JSON Docs", f"<h1>JSON Docs</h1><p class=muted>"
+                           f"{format_result_count(len(keys))}</p><ul>{links}</ul>"))
+    # Manifeste écrit en dernier : un export interrompu sera repris
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    progress.finish()
+    return len(pending), len(keys) - len(pending), len(removed)
+
+
 def main(page: ft.Page):
     # Configuration de la page
     page.title = "JSON Docs Viewer"
@@ -70,290 +2064,918 @@ def main(page: ft.Page):
     page.spacing = 0
     
     # --- ÉTAT DE L'APPLICATION ---
+    # Le catalogue et ses index sont partagés entre sessions (catalog_store) ;
+    # la session ne garde que des références, sa sélection et ses recherches.
+    server_mode = bool(SERVER_DOCS)
+    catalog_entry = None  # SharedCatalog affiché
     json_data = {}
+    search_index = SearchIndex([])
+    fulltext_index = None  # Disponible une fois construit par l'entrée partagée
     current_key = None
     theme_mode = 'light'
-    favorites = []
+    favorites = ClientFavoritesStore(page) if server_mode else FavoritesStore()
+    property_row_pool = []  # Lignes de propriétés libérées, prêtes à resservir
+    
+    def recycle_rows(rows):
+        # Rend au pool les lignes d'une vue abandonnée, dans la limite du pool
+        room = PROPERTY_ROW_POOL_SIZE - len(property_row_pool)
+        if room > 0 and rows:
+            property_row_pool.extend(rows[:room])
+    
+    detail_views = LRUCache(
+        SERVER_DETAIL_VIEW_CACHE_SIZE if server_mode else DETAIL_VIEW_CACHE_SIZE,
+        on_evict=lambda key, view: recycle_rows(view.data)
+    )
+    prefetch_stats = PrefetchStats()
+    
+    def discard_prefetched(key, view):
+        prefetch_stats.wasted += 1
+        recycle_rows(view.data)
+    
+    # Vues préconstruites, déplacées dans detail_views à leur affichage
+    prefetched_views = LRUCache(
+        SERVER_PREFETCH_VIEW_CACHE_SIZE if server_mode else PREFETCH_VIEW_CACHE_SIZE,
+        on_evict=discard_prefetched
+    )
+    prefetcher = Debouncer(PREFETCH_DELAY)
     drawer_search_query = ""
     appbar_search_query = ""
     search_mode = False
+    typing_in = None  # Champ de recherche qui a le focus ('appbar', 'drawer')
+    loaded_path = None
+    watch_mode = False
+    file_watcher = None
+    perf_mode = False
+    theme_registry = ThemeRegistry(COLORS[theme_mode])
+    themed = theme_registry.bind
+    tracer = PerfTracer(enabled=os.environ.get(PERF_TRACE_ENV) == '1')
+    if page.connection:
+        tracer.instrument_connection(page.connection)
+    ui = UpdateBatcher(page, tracer=tracer)
+    batched = ui.batched
+    page.session.set("update_batcher", ui)  # Diagnostic : envois par action
+    snack_bar = None
     
     def get_theme():
         return COLORS[theme_mode]
     
     def apply_theme():
+        # Recolore les contrôles existants ; l'appelant envoie la mise à jour
         theme = get_theme()
         page.bgcolor = theme['bg']
         page.theme_mode = ft.ThemeMode.LIGHT if theme_mode == 'light' else ft.ThemeMode.DARK
-        page.update()
+        theme_registry.set_theme(theme)
+        style_drawer()
+    
+    def show_snack_bar(message, bgcolor=None):
+        # Remplace la notification précédente, dans le même envoi que le reste
+        # de l'action (page.open enverrait sa propre mise à jour).
+        nonlocal snack_bar
+        if snack_bar in page.overlay:
+            page.overlay.remove(snack_bar)
+        snack_bar = ft.SnackBar(content=ft.Text(message), bgcolor=bgcolor, open=True)
+        page.overlay.append(snack_bar)
+        ui.update()
+    
+    # --- GESTION DES FAVORIS ---
+    @batched
+    def toggle_favorite(key):
+        # L'écriture sur disque se fait plus tard, hors du clic
+        favorites.toggle(key)
+        render_content()
+    
+    def favorites_loaded():
+        # Mode serveur : favoris du navigateur arrivés après l'affichage
+        with ui.action('favorites_loaded'):
+            if json_data:
+                update_drawer_items()
+                render_content()
+    
+    if server_mode:
+        favorites.on_loaded = favorites_loaded
+    
+    # --- GESTION DU FICHIER ---
+    load_cancel = None  # Event du chargement en cours
+    loads_done = 0
+    load_bar_ref = ft.Ref[ft.ProgressBar]()
+    load_status_ref = ft.Ref[ft.Text]()
+    
+    @batched
+    def pick_file_result(e: ft.FilePickerResultEvent):
+        # Un ou plusieurs fichiers, ou un dossier (get_directory_path)
+        paths = [f.path for f in e.files] if e.files else [e.path] if e.path else []
+        if paths:
+            start_load(paths)
+        else:
+            ui.update()
+    
+    @batched
+    def start_load(paths):
+        nonlocal load_cancel
+        # Un nouveau chargement remplace celui en cours
+        if load_cancel:
+            load_cancel.set()
+        load_cancel = threading.Event()
+        label = os.path.basename(paths[0]) if len(paths) == 1 else f"{len(paths)} fichiers"
+        content_column.controls = [render_loading_state(label)]
+        ui.update()
+        ui.flush()  # Le panneau doit être affiché avant le premier rapport
+        threading.Thread(
+            target=run_load,
+            args=(paths, load_cancel),
+            daemon=True
+        ).start()
+    
+    def cancel_load(e=None):
+        if load_cancel:
+            load_cancel.set()
+    
+    @batched
+    def show_load_progress(progress):
+        if not load_bar_ref.current:
+            return
+        load_bar_ref.current.value = progress.fraction
+        if progress.phase == "Analyse":
+            load_bar_ref.current.value = None  # Durée inconnue : barre animée
+            load_status_ref.current.value = "Analyse du JSON..."
+        else:
+            load_status_ref.current.value = (
+                f"{progress.phase} : {progress.done / 1e6:.1f} / "
+                f"{progress.total / 1e6:.1f} Mo · {progress.throughput:.1f} Mo/s"
+            )
+        ui.update(load_bar_ref.current, load_status_ref.current)
+    
+    def run_load(paths, cancel):
+        # Compte les chargements terminés : réussis, annulés ou en erreur
+        nonlocal loads_done
+        try:
+            load_file(paths, cancel)
+        finally:
+            loads_done += 1
+    
+    def load_file(paths, cancel):
+        # Exécuté dans un thread : l'interface reste utilisable pendant la lecture.
+        # Chaque rapport de progression est un envoi à part ; l'affichage du
+        # fichier chargé n'en fait qu'un.
+        
+        def report(progress):
+            if cancel is load_cancel:
+                show_load_progress(progress)
+        
+        try:
+            with tracer.span('load', files=len(paths)) as trace:
+                progress = LoadProgress(0, report, cancel)
+                # Déjà en mémoire si une autre session a ouvert ce fichier
+                entry = catalog_store.acquire(paths, progress)
+                trace.update(
+                    bytes=entry.progress.total,
+                    backend=entry.progress.backend,
+                    shared=entry.progress is not progress,
+                    phases={phase: round(seconds * 1000, 2)
+                            for phase, (seconds, _) in progress.timings.items()}
+                )
+        except LoadCancelled:
+            if cancel is load_cancel:
+                with ui.action('load_file'):
+                    show_snack_bar("Chargement annulé")
+                    render_content()
+            return
+        except Exception as ex:
+            if cancel is load_cancel:
+                with ui.action('load_file'):
+                    show_snack_bar(f"Erreur: {str(ex)}", Colors.RED_400)
+                    render_content()
+            return
+        
+        if cancel is not load_cancel:
+            # Remplacé entre-temps par un autre chargement
+            catalog_store.release(entry)
+            return
+        
+        with ui.action('load_file'):
+            apply_catalog(entry, shared=entry.progress is not progress)
+    
+    def use_catalog(entry):
+        # Remplace le catalogue affiché par `entry` (déjà acquise)
+        nonlocal catalog_entry, json_data, search_index, fulltext_index
+        release_catalog()
+        catalog_entry = entry
+        json_data = entry.catalog
+        search_index = entry.search_index
+        fulltext_index = None
+        entry.on_fulltext(fulltext_ready)
+    
+    def release_catalog():
+        nonlocal catalog_entry
+        if catalog_entry:
+            catalog_entry.remove_listener(fulltext_ready)
+            catalog_store.release(catalog_entry)
+            catalog_entry = None
+    
+    def apply_catalog(entry, shared=False):
+        nonlocal current_key, loaded_path
+        stop_watch()
+        use_catalog(entry)
+        loaded_path = entry.path
+        favorites.open(favorites_path(entry.path))
+        if watch_mode:
+            start_watch()
+        
+        drawer_items.clear()
+        prefetcher.cancel()
+        detail_views.clear()
+        prefetched_views.clear()
+        if search_index.keys:
+            current_key = search_index.keys[0]
+        
+        if isinstance(json_data, WorkspaceCatalog):
+            loaded = f"{len(json_data.catalogs)} fichiers chargés"
+        else:
+            loaded = "Fichier chargé avec succès!"
+        summary = "déjà en mémoire" if shared else entry.progress.summary()
+        show_snack_bar(f"{loaded} ({summary})", get_theme()['success'])
+        render_content()
+        update_nav_bar()
+        open_drawer()
+    
+    # --- RECHARGEMENT À CHAUD ---
+    def start_watch():
+        nonlocal file_watcher
+        stop_watch()
+        entry = catalog_entry
+        if entry is None or isinstance(entry.catalog, WorkspaceCatalog):
+            return  # Seul un fichier unique est surveillé
+        try:
+            file_watcher = FileWatcher(loaded_path, reload_changed_file)
+        except OSError:
+            return
+        # Empreintes calculées avant toute modification du fichier (partagées)
+        threading.Thread(target=entry.fingerprints, daemon=True).start()
+    
+    def stop_watch():
+        nonlocal file_watcher
+        if file_watcher:
+            file_watcher.stop()
+            file_watcher = None
+    
+    @batched
+    def toggle_watch_mode(e):
+        nonlocal watch_mode
+        watch_mode = not watch_mode
+        if watch_mode and loaded_path:
+            start_watch()
+        else:
+            stop_watch()
+        show_snack_bar(
+            "Surveillance du fichier activée" if watch_mode
+            else "Surveillance du fichier désactivée"
+        )
+        update_nav_bar()
     
-    # --- GESTION DES FAVORIS ---
-    def load_favorites():
-        nonlocal favorites
+    def reload_changed_file(path):
+        # Exécuté dans le thread de surveillance : relit le fichier (une fois
+        # pour toutes les sessions qui le surveillent), compare les composants
+        # et ne rafraîchit que ce qui a changé.
+        base = catalog_entry
+        if base is None:
+            return
         try:
-            if os.path.exists('favorites.json'):
-                with open('favorites.json', 'r') as f:
-                    favorites = json.load(f)
-        except Exception:
-            favorites = []
-    
-    def save_favorites():
+            entry = catalog_store.acquire([path])
+        except Exception as ex:
+            logger.warning("Rechargement de %s impossible : %s", path, ex)
+            return
         try:
-            with open('favorites.json', 'w') as f:
-                json.dump(favorites, f)
+            new = entry.fingerprints()
+            try:
+                diff = diff_catalogs(base.fingerprints(), new)
+            except CatalogChanged:
+                # Empreintes pas encore calculées quand le fichier a changé :
+                # tous les composants communs sont considérés comme modifiés
+                old = base.catalog
+                diff = (
+                    [key for key in new if key not in old],
+                    [key for key in old if key not in new],
+                    [key for key in new if key in old]
+                )
         except Exception:
-            pass
+            diff = None  # Catalogue précédent fermé entre-temps
+        with ui.action('hot_reload'):
+            if diff is None or base is not catalog_entry or path != loaded_path:
+                catalog_store.release(entry)  # Un autre fichier a été ouvert entre-temps
+                return
+            apply_catalog_diff(entry, *diff)
     
-    def toggle_favorite(key):
-        nonlocal favorites
-        if key in favorites:
-            favorites.remove(key)
-        else:
-            favorites.append(key)
-        save_favorites()
-        render_content()
+    def apply_catalog_diff(entry, added, removed, changed):
+        nonlocal current_key
+        use_catalog(entry)
+        if not (added or removed or changed):
+            return
+        
+        # Vues périmées uniquement
+        for key in removed + changed:
+            for cache in (detail_views, prefetched_views):
+                cache.pop((key, True))
+                cache.pop((key, False))
+        for key in removed:
+            drawer_items.pop(key, None)
+        if added or removed:
+            update_drawer_items()
+        
+        if current_key not in json_data:
+            current_key = search_index.keys[0] if search_index.keys else None
+            style_drawer_item(current_key)
+            render_content()
+        elif current_key in changed:
+            render_content()
+        show_snack_bar(
+            f"Fichier mis à jour : {len(added)} ajouté(s), "
+            f"{len(removed)} supprimé(s), {len(changed)} modifié(s)",
+            get_theme()['success']
+        )
     
-    # --- GESTION DU FICHIER ---
-    def pick_file_result(e: ft.FilePickerResultEvent):
-        nonlocal json_data, current_key
-        if e.files:
-            try:
-                with open(e.files[0].path, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                
-                keys = sorted(json_data.keys())
-                if keys:
-                    current_key = keys[0]
-                
-                page.open(ft.SnackBar(
-                    content=ft.Text("Fichier chargé avec succès!"),
-                    bgcolor=get_theme()['success']
-                ))
-                render_content()
-                update_nav_bar()
-                open_drawer()
-            except Exception as ex:
-                page.open(ft.SnackBar(
-                    content=ft.Text(f"Erreur: {str(ex)}"),
-                    bgcolor=Colors.RED_400
-                ))
-        page.update()
+    def fulltext_ready(index):
+        # La navigation par nom est disponible dès le chargement, la
+        # recherche plein texte une fois l'index partagé construit.
+        nonlocal fulltext_index
+        with ui.action('fulltext_index'):
+            if catalog_entry is None or catalog_entry.fulltext_index is not index:
+                return  # Index d'un catalogue qui n'est plus affiché
+            fulltext_index = index
+            if search_mode and len(appbar_search_query) >= FULLTEXT_MIN_QUERY:
+                show_search_results(fulltext_index.search(appbar_search_query))
     
     file_picker = ft.FilePicker(on_result=pick_file_result)
     page.overlay.append(file_picker)
     
     # --- COPIER LE CODE ---
-    def copy_code(description):
-        import re
-        match = re.search(r'```python\s*([\s\S]*?)```', description)
-        if match and match.group(1):
-            page.set_clipboard(match.group(1).strip())
-            page.open(ft.SnackBar(
-                content=ft.Text("Code copié!"),
-                bgcolor=get_theme()['success']
-            ))
-            page.update()
+    def describe(key):
+        return catalog_entry.describe(key)  # Analyse partagée entre sessions
+    
+    @batched
+    def copy_code(info):
+        if info.code_blocks:
+            page.set_clipboard(info.code_blocks[0])
+            show_snack_bar("Code copié!", get_theme()['success'])
     
     # --- DRAWER (BIBLIOTHÈQUE) ---
     drawer_ref = ft.Ref[ft.NavigationDrawer]()
+    drawer_keys = KeyOrder()  # Liste filtrée complète, ordre de navigation
+    drawer_window = 0  # Position (dans drawer_keys) de la première entrée construite
+    drawer_window_end = 0  # Et de la suivante de la dernière
+    drawer_first_visible = 0  # D'après le dernier événement de défilement
+    drawer_rows = []  # Entrées réutilisables, par position dans la fenêtre
+    drawer_items = {}  # Clé -> entrée qui l'affiche actuellement
     
-    def filter_drawer_keys():
+    def filter_drawer_keys(query=None):
         if not json_data:
             return []
         
-        all_keys = sorted(json_data.keys())
-        
-        # Filtrer par recherche
-        if drawer_search_query:
-            all_keys = [k for k in all_keys if drawer_search_query.lower() in k.lower()]
-        
-        # Trier par favoris
-        all_keys.sort(key=lambda k: (k not in favorites, k))
-        return all_keys
+        with tracer.span('filter_drawer_keys') as trace:
+            # Filtrer par recherche (l'index renvoie les clés déjà triées)
+            all_keys = search_index.search(drawer_search_query if query is None else query)
+            
+            # Favoris en tête, en conservant l'ordre alphabétique
+            trace['results'] = len(all_keys)
+            return (
+                [k for k in all_keys if k in favorites]
+                + [k for k in all_keys if k not in favorites]
+            )
+    
+    drawer_search_debouncer = Debouncer(SEARCH_DEBOUNCE_SECONDS)
     
     def on_drawer_search_change(e):
         nonlocal drawer_search_query
         drawer_search_query = e.control.value
-        update_drawer_items()
+        drawer_search_debouncer.submit(update_drawer_items)
+    
+    def bind_drawer_window(start, size=DRAWER_WINDOW_SIZE):
+        # Affiche les clés [start, start + size) dans les entrées existantes.
+        # Les espaceurs gardent la hauteur totale de la liste (et donc la
+        # position de défilement) : le diff reste borné par la fenêtre.
+        nonlocal drawer_window, drawer_window_end
+        end = drawer_window_end = min(start + size, len(drawer_keys))
+        drawer_window = start
+        drawer_items.clear()
+        items = [get_drawer_item(i - start, drawer_keys[i]) for i in range(start, end)]
+        drawer_top.height = start * DRAWER_ITEM_HEIGHT
+        drawer_bottom.height = (len(drawer_keys) - end) * DRAWER_ITEM_HEIGHT
+        drawer_list.controls = [drawer_top, *items, drawer_bottom]
     
-    def update_drawer_items():
+    def drawer_window_start(first, size=DRAWER_WINDOW_SIZE):
+        # Fenêtre qui couvre la zone visible, avec une marge de chaque côté
+        return max(0, min(first - DRAWER_PAGE_SIZE // 2, len(drawer_keys) - size))
+    
+    @batched
+    def on_drawer_scroll(e: ft.OnScrollEvent):
+        # Déplace la fenêtre quand la zone visible approche de l'un de ses bords
+        nonlocal drawer_first_visible
+        if e.pixels is None or not e.viewport_dimension:
+            return
+        first = drawer_first_visible = int(e.pixels // DRAWER_ITEM_HEIGHT)
+        last = int((e.pixels + e.viewport_dimension) // DRAWER_ITEM_HEIGHT)
+        margin = DRAWER_PAGE_SIZE // 4
+        if ((drawer_window == 0 or first >= drawer_window + margin)
+                and (drawer_window_end == len(drawer_keys) or last < drawer_window_end - margin)):
+            return
+        with tracer.span('drawer_window', start=drawer_window_start(first)):
+            bind_drawer_window(drawer_window_start(first))
+        ui.update(drawer_list)
+    
+    @batched
+    def update_drawer_items(is_current=None, query=None):
+        # Seuls la liste et le compteur changent : l'en-tête et le champ de
+        # recherche sont conservés, les entrées déjà construites sont réutilisées.
+        nonlocal drawer_keys
         if drawer_ref.current:
-            filtered = filter_drawer_keys()
-            theme = get_theme()
-            
-            drawer_ref.current.controls = [
-                # En-tête
-                ft.Container(
-                    content=ft.Row([
-                        ft.Text(
-                            "Bibliothèque",
-                            size=22,
-                            weight=ft.FontWeight.W_800,
-                            color=theme['text']
-                        ),
-                        ft.IconButton(
-                            icon=Icons.CLOSE,
-                            icon_color=theme['subtext'],
-                            on_click=close_drawer
-                        )
-                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                    padding=20,
-                    border=ft.border.only(bottom=ft.border.BorderSide(1, theme['border']))
-                ),
-                
-                # Barre de recherche
-                ft.Container(
-                    content=ft.TextField(
-                        hint_text="Rechercher...",
-                        prefix_icon=Icons.SEARCH,
-                        border_color=Colors.TRANSPARENT,
-                        bgcolor=theme['codebg'],
-                        color=theme['text'],
-                        on_change=on_drawer_search_change,
-                        value=drawer_search_query
-                    ),
-                    padding=ft.padding.symmetric(15, 10)
-                ),
-                
-                # Liste des items
-                ft.Container(
-                    content=ft.Column(
-                        controls=[
-                            create_drawer_item(key)
-                            for key in filtered
-                        ],
-                        scroll=ft.ScrollMode.AUTO,
-                        spacing=0
-                    ),
-                    expand=True
-                )
-            ]
-            page.update()
+            filtered = filter_drawer_keys(query)
+            if is_current and not is_current():
+                return  # Une frappe plus récente a pris le relais
+            drawer_keys = KeyOrder(filtered)
+            with tracer.span('update_drawer_items') as trace:
+                built = len(drawer_rows)
+                # Le client garde sa position de défilement (ramenée dans la
+                # nouvelle liste si elle est plus courte). Une page suffit à
+                # l'affichage ; la fenêtre complète suit au premier défilement.
+                start = drawer_window_start(drawer_first_visible, DRAWER_PAGE_SIZE)
+                bind_drawer_window(start, DRAWER_PAGE_SIZE)
+                trace['built'] = len(drawer_rows) - built
+            drawer_count.value = format_result_count(len(drawer_keys))
+            ui.update(drawer_count, drawer_list)
     
-    def create_drawer_item(key):
+    def style_drawer_item(key):
+        # Ne modifie que les entrées dont l'état (clé, favori, actif, thème) a changé
+        item = drawer_items.get(key)
+        if item is None:
+            return
+        state = (key, key in favorites, current_key == key, theme_mode)
+        if item.data == state:
+            return
+        item.data = state
+        _, is_fav, is_active, _ = state
         theme = get_theme()
-        is_fav = key in favorites
-        is_active = current_key == key
-        
-        def select_item(e):
-            nonlocal current_key
-            current_key = key
-            close_drawer()
-            render_content()
-        
+        star, label = item.content.controls
+        star.visible = is_fav
+        label.color = theme['primary'] if is_active else theme['text']
+        label.weight = ft.FontWeight.W_700 if is_active else ft.FontWeight.W_400
+        item.bgcolor = theme['codebg'] if is_active else None
+        item.border = ft.border.only(
+            left=ft.border.BorderSide(4, theme['primary'])
+        ) if is_active else None
+    
+    def get_drawer_item(position, key):
+        # L'entrée de cette position est réaffectée à la clé : mêmes contrôles
+        # côté client, seuls le libellé et le style changent.
+        if position == len(drawer_rows):
+            drawer_rows.append(create_drawer_item())
+        item = drawer_rows[position]
+        item.content.controls[1].value = key
+        drawer_items[key] = item
+        style_drawer_item(key)
+        return item
+    
+    @batched
+    def select_component(key):
+        nonlocal current_key
+        previous_key = current_key
+        current_key = key
+        style_drawer_item(previous_key)
+        style_drawer_item(key)
+        render_content()
+    
+    @batched
+    def select_drawer_item(e):
+        select_component(e.control.data[0])  # Clé affichée par l'entrée
+        close_drawer()
+    
+    def create_drawer_item():
         return ft.Container(
             content=ft.Row([
                 ft.Icon(
                     Icons.STAR,
                     color="#FFD700",
-                    size=14,
-                    visible=is_fav
+                    size=14
                 ),
                 ft.Text(
-                    key,
-                    color=theme['primary'] if is_active else theme['text'],
-                    weight=ft.FontWeight.W_700 if is_active else ft.FontWeight.W_400,
                     size=16
                 )
             ], spacing=8),
-            padding=ft.padding.symmetric(20, 16),
-            on_click=select_item,
-            bgcolor=theme['codebg'] if is_active else None,
-            border=ft.border.only(
-                left=ft.border.BorderSide(4, theme['primary'])
-            ) if is_active else None
+            height=DRAWER_ITEM_HEIGHT,
+            padding=ft.padding.symmetric(20, 0),
+            alignment=ft.alignment.center_left,
+            on_click=select_drawer_item
         )
     
+    def style_drawer():
+        # Les entrées dépendent aussi de l'état favori/actif : style dédié
+        for key in list(drawer_items):
+            style_drawer_item(key)
+    
+    @batched
     def open_drawer():
         if drawer_ref.current and json_data:
             update_drawer_items()
             drawer_ref.current.open = True
-            page.update()
+            ui.update()
     
+    @batched
     def close_drawer(e=None):
         if drawer_ref.current:
             drawer_ref.current.open = False
-            page.update()
+            ui.update()
     
     # --- TOGGLE THÈME ---
+    @batched
     def toggle_theme(e):
         nonlocal theme_mode
         theme_mode = 'dark' if theme_mode == 'light' else 'light'
+        # Aucune vue n'est reconstruite : un seul envoi des couleurs modifiées,
+        # tranches de propriétés affichées comprises (isolées)
         apply_theme()
-        render_content()
-        update_nav_bar()
+        ui.update()
+        view = displayed_view()
+        slices = [c for c in view.controls if isinstance(c, PropertySlice)] if view else []
+        if slices:
+            ui.update(*slices)
     
     # --- RECHERCHE DANS L'APPBAR ---
+    @batched
     def toggle_search_mode(e):
         nonlocal search_mode
         search_mode = not search_mode
+        hide_search_results()
         update_nav_bar()
     
+    appbar_search_debouncer = Debouncer(SEARCH_DEBOUNCE_SECONDS)
+    
     def on_appbar_search_change(e):
-        nonlocal appbar_search_query, current_key
+        nonlocal appbar_search_query
         appbar_search_query = e.control.value.lower()
         
         if not json_data:
             return
         
-        # Filtrer les clés
-        filtered_keys = [k for k in json_data.keys() if appbar_search_query in k.lower()]
+        appbar_search_debouncer.submit(run_appbar_search)
+    
+    @batched
+    def run_appbar_search(is_current):
+        nonlocal current_key
+        
+        with tracer.span('search') as trace:
+            # Filtrer les clés (déjà triées par l'index)
+            filtered_keys = search_index.search(appbar_search_query)
+            # Résultats classés dans les descriptions et les propriétés
+            hits = None
+            if fulltext_index and len(appbar_search_query) >= FULLTEXT_MIN_QUERY:
+                hits = fulltext_index.search(appbar_search_query)
+            trace.update(results=len(filtered_keys), fulltext=len(hits or ()))
+        if not is_current():
+            return  # Une frappe plus récente a pris le relais
+        
+        if appbar_count_ref.current:
+            appbar_count_ref.current.value = format_result_count(len(filtered_keys))
+        
+        if len(appbar_search_query) >= FULLTEXT_MIN_QUERY:
+            show_search_results(hits)
+        else:
+            hide_search_results()
         
-        if filtered_keys:
-            # Trier et sélectionner la première
-            filtered_keys.sort()
-            current_key = filtered_keys[0]
+        if filtered_keys or hits:
+            # Sélectionner la première (par nom, sinon la plus pertinente)
+            current_key = filtered_keys[0] if filtered_keys else hits[0][0]
             render_content()
+        else:
+            ui.update()
     
+    @batched
     def clear_appbar_search(e):
-        nonlocal appbar_search_query, search_mode
+        nonlocal appbar_search_query, search_mode, typing_in
+        appbar_search_debouncer.cancel()
         appbar_search_query = ""
         search_mode = False
+        if typing_in == 'appbar':
+            typing_in = None  # Le champ disparaît sans signaler sa perte de focus
+        hide_search_results()
         update_nav_bar()
         if json_data and current_key:
             render_content()
     
+    # --- NAVIGATION AU CLAVIER ---
+    def set_typing(field):
+        def on_focus_change(e):
+            nonlocal typing_in
+            if e.name == 'focus':
+                typing_in = field
+            elif typing_in == field:
+                typing_in = None
+        return on_focus_change
+    
+    @batched
+    def navigate(delta):
+        # Suivant/précédent dans la liste filtrée du tiroir, en O(1)
+        key = drawer_keys.step(current_key, delta)
+        if key is not None and key != current_key:
+            select_component(key)
+    
+    @batched
+    def next_favorite():
+        # Premier favori, puis le suivant à chaque appui
+        keys = [key for key in favorites if key in json_data]
+        if not keys:
+            show_snack_bar("Aucun favori")
+            return
+        i = keys.index(current_key) + 1 if current_key in favorites else 0
+        select_component(keys[i % len(keys)])
+    
+    keyboard_busy = threading.Lock()  # Navigation au clavier en cours
+    
+    def on_keyboard_event(e: ft.KeyboardEvent):
+        ctrl = e.ctrl or e.meta
+        action = KEYBOARD_SHORTCUTS.get((e.key, ctrl))
+        if action is None or e.alt or not json_data:
+            return
+        if typing_in and not ctrl and action != 'escape':
+            return  # Frappe dans un champ de recherche
+        if action not in KEYBOARD_REPEATABLE:
+            run_shortcut(action, e)
+        elif keyboard_busy.acquire(blocking=False):
+            try:
+                run_shortcut(action, e)
+            finally:
+                keyboard_busy.release()
+    
+    @batched
+    def run_shortcut(action, e):
+        nonlocal typing_in
+        with tracer.span('keyboard', action=action):
+            if action == 'next':
+                navigate(1)
+            elif action == 'previous':
+                navigate(-1)
+            elif action == 'next_page':
+                navigate(KEYBOARD_PAGE_STEP)
+            elif action == 'previous_page':
+                navigate(-KEYBOARD_PAGE_STEP)
+            elif action == 'first':
+                navigate(-len(drawer_keys))
+            elif action == 'last':
+                navigate(len(drawer_keys))
+            elif action == 'next_favorite':
+                next_favorite()
+            elif action == 'search':
+                if not search_mode:
+                    toggle_search_mode(e)
+            elif action == 'escape':
+                typing_in = None
+                if search_mode:
+                    clear_appbar_search(e)
+                else:
+                    close_drawer()
+    
+    # --- RÉSULTATS PLEIN TEXTE ---
+    search_results_list = ft.ListView(spacing=0, expand=True)
+    search_results_status = themed(ft.Text(size=11), color='subtext')
+    search_results_panel = themed(ft.Container(
+        content=ft.Column([
+            ft.Container(
+                content=search_results_status,
+                padding=ft.padding.only(20, 8, 20, 4)
+            ),
+            search_results_list
+        ], spacing=0),
+        height=240,
+        visible=False
+    ), bgcolor='card', border=lambda t: ft.border.only(bottom=ft.border.BorderSide(1, t['border'])))
+    
+    def create_search_result(key, score):
+        def select_result(e):
+            select_component(key)
+        
+        try:
+            description = json_data[key].description
+        except CatalogChanged:
+            description = None  # Fichier modifié : rechargement en attente
+        return ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    themed(ft.Text(key, size=14, weight=ft.FontWeight.W_600, expand=True), color='text'),
+                    themed(ft.Text(f"{score:.1f}", size=11), color='subtext')
+                ]),
+                themed(ft.Text(
+                    fulltext_snippet(description, appbar_search_query),
+                    size=12,
+                    max_lines=1,
+                    overflow=ft.TextOverflow.ELLIPSIS
+                ), color='subtext')
+            ], spacing=2),
+            padding=ft.padding.symmetric(6, 20),
+            on_click=select_result
+        )
+    
+    def show_search_results(hits):
+        # hits à None : l'index est encore en construction
+        if hits is None:
+            search_results_status.value = "Indexation du texte en cours…"
+            search_results_list.controls = []
+        else:
+            search_results_status.value = (
+                f"{format_result_count(len(hits))} dans les descriptions et propriétés · "
+                f"{fulltext_index.summary()}"
+            )
+            search_results_list.controls = [create_search_result(k, s) for k, s in hits]
+        search_results_panel.visible = True
+        ui.update(search_results_panel)
+    
+    def hide_search_results():
+        if search_results_panel.visible:
+            search_results_panel.visible = False
+            search_results_list.controls = []
+            ui.update(search_results_panel)
+    
+    # --- PANNEAU DE PERFORMANCES ---
+    trace_at_startup = tracer.enabled
+    perf_stop = None  # Event qui arrête le rafraîchissement du panneau
+    perf_seen = 0  # Mesures déjà affichées
+    perf_breakdown = themed(ft.Text(size=12, weight=ft.FontWeight.W_600, expand=True), color='primary')
+    perf_report = themed(ft.Text(size=11, font_family="monospace", selectable=True), color='text')
+    
+    @batched
+    def export_trace_result(e: ft.FilePickerResultEvent):
+        if not e.path:
+            return
+        try:
+            count = tracer.export(e.path)
+            show_snack_bar(f"Trace exportée : {count} mesures", get_theme()['success'])
+        except OSError as ex:
+            show_snack_bar(f"Erreur: {str(ex)}", Colors.RED_400)
+    
+    trace_picker = ft.FilePicker(on_result=export_trace_result)
+    page.overlay.append(trace_picker)
+    
+    @batched
+    def clear_trace(e):
+        tracer.clear()
+        refresh_perf_panel()
+    
+    perf_panel = themed(ft.Container(
+        content=ft.Column([
+            ft.Row([
+                perf_breakdown,
+                ft.TextButton(
+                    "Exporter",
+                    icon=Icons.DOWNLOAD,
+                    on_click=lambda _: trace_picker.save_file(
+                        file_name="json-docs-trace.json",
+                        allowed_extensions=["json"]
+                    )
+                ),
+                ft.TextButton("Effacer", icon=Icons.DELETE_OUTLINE, on_click=clear_trace)
+            ]),
+            ft.Column([perf_report], scroll=ft.ScrollMode.AUTO, expand=True)
+        ], spacing=4),
+        padding=ft.padding.symmetric(8, 20),
+        height=220,
+        visible=False
+    ), bgcolor='codebg', border=lambda t: ft.border.only(bottom=ft.border.BorderSide(1, t['border'])))
+    
+    def format_perf_report():
+        # Mesures triées par temps total décroissant
+        lines = [prefetch_stats.summary(), f"{'mesure':<24}{'n':>6}{'moy ms':>10}{'max ms':>10}  dernière"]
+        stats = sorted(tracer.summary().items(), key=lambda item: -item[1][1])
+        for name, (count, total, worst, meta) in stats:
+            detail = " ".join(f"{k}={v}" for k, v in meta.items())
+            lines.append(f"{name:<24}{count:>6}{total / count:>10.2f}{worst:>10.2f}  {detail}")
+        # Envois page.update() par action, sur les dernières actions
+        actions = sorted(ui.updates_per_action().items(), key=lambda item: -item[1][1])
+        if actions:
+            lines.append(f"\n{'action':<24}{'n':>6}{'envois':>10}")
+            for action, (count, sent) in actions:
+                lines.append(f"{action:<24}{count:>6}{sent:>10.2f}")
+        return "\n".join(lines)
+    
+    def refresh_perf_panel():
+        nonlocal perf_seen
+        with ui.action('refresh_perf_panel'):
+            breakdown = tracer.breakdown()
+            perf_breakdown.value = " · ".join(
+                f"{category} {ms:.0f} ms" for category, ms in breakdown.items()
+            ) or "Aucune mesure pour l'instant"
+            perf_report.value = format_perf_report()
+            ui.update(perf_panel)
+        # Compté après l'envoi : le rafraîchissement ne se relance pas lui-même
+        perf_seen = tracer.recorded
+    
+    def follow_perf(stop):
+        # Rafraîchit le panneau tant qu'il est ouvert, s'il y a du nouveau
+        while not stop.wait(PERF_PANEL_INTERVAL):
+            if tracer.recorded != perf_seen:
+                refresh_perf_panel()
+    
+    @batched
+    def toggle_perf_mode(e):
+        nonlocal perf_mode, perf_stop
+        perf_mode = not perf_mode
+        tracer.enabled = perf_mode or trace_at_startup
+        perf_panel.visible = perf_mode
+        if perf_stop:
+            perf_stop.set()
+            perf_stop = None
+        if perf_mode:
+            perf_stop = threading.Event()
+            threading.Thread(target=follow_perf, args=(perf_stop,), daemon=True).start()
+            refresh_perf_panel()
+        else:
+            ui.update(perf_panel)
+        update_nav_bar()
+    
     # --- RENDU DU CONTENU ---
+    # Pas de défilement ici : la vue détaillée gère le sien (ListView)
     content_column = ft.Column(
         spacing=0,
-        expand=True,
-        scroll=ft.ScrollMode.AUTO
+        expand=True
     )
     
+    def render_loading_state(label):
+        return ft.Container(
+            content=ft.Column([
+                themed(ft.Text(
+                    "Chargement",
+                    size=20,
+                    weight=ft.FontWeight.W_700
+                ), color='text'),
+                themed(ft.Text(
+                    label,
+                    size=14
+                ), color='subtext'),
+                themed(ft.ProgressBar(
+                    ref=load_bar_ref,
+                    value=0,
+                    width=320
+                ), color='primary', bgcolor='codebg'),
+                themed(ft.Text(
+                    "",
+                    ref=load_status_ref,
+                    size=13
+                ), color='subtext'),
+                ft.TextButton(
+                    "Annuler",
+                    icon=Icons.CLOSE,
+                    on_click=cancel_load
+                )
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=15),
+            expand=True,
+            alignment=ft.alignment.center
+        )
+    
+    def render_changed_state():
+        # Le fichier affiché a été réécrit : ses composants ne sont plus lisibles
+        message = (
+            "Fichier modifié sur disque, rechargement en cours…" if file_watcher
+            else "Fichier modifié sur disque : rouvrez-le pour afficher ce composant."
+        )
+        return ft.Container(
+            content=themed(ft.Text(message, size=16, italic=True), color='subtext'),
+            expand=True,
+            alignment=ft.alignment.center
+        )
+    
     def render_empty_state():
-        theme = get_theme()
         return ft.Container(
             content=ft.Column([
-                ft.Container(
-                    content=ft.Icon(
+                themed(ft.Container(
+                    content=themed(ft.Icon(
                         Icons.CLOUD_UPLOAD_OUTLINED,
-                        size=40,
-                        color=theme['primary']
-                    ),
+                        size=40
+                    ), color='primary'),
                     width=80,
                     height=80,
-                    bgcolor=theme['codebg'],
                     border_radius=40,
                     alignment=ft.alignment.center
-                ),
-                ft.Text(
+                ), bgcolor='codebg'),
+                themed(ft.Text(
                     "Aucun fichier chargé",
                     size=20,
-                    weight=ft.FontWeight.W_700,
-                    color=theme['text']
-                ),
-                ft.ElevatedButton(
+                    weight=ft.FontWeight.W_700
+                ), color='text'),
+                themed(ft.ElevatedButton(
                     "Ouvrir un fichier JSON",
-                    bgcolor=theme['primary'],
                     color="#FFFFFF",
                     on_click=lambda _: file_picker.pick_files(
-                        allowed_extensions=["json"]
+                        allowed_extensions=["json"],
+                        allow_multiple=True
                     ),
                     style=ft.ButtonStyle(
                         padding=ft.padding.symmetric(30, 15),
                         shape=ft.RoundedRectangleBorder(radius=30)
                     )
-                )
+                ), bgcolor='primary'),
+                themed(ft.TextButton(
+                    "Ouvrir un dossier",
+                    icon=Icons.FOLDER_OPEN_OUTLINED,
+                    on_click=lambda _: file_picker.get_directory_path()
+                ), icon_color='primary')
             ], 
             alignment=ft.MainAxisAlignment.CENTER,
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -362,109 +2984,142 @@ def main(page: ft.Page):
             alignment=ft.alignment.center
         )
     
-    def render_property_row(key, val, is_last):
-        theme = get_theme()
-        explanation = val.get('description') or PROPERTY_DOCS.get(key)
-        
-        prop_container = ft.Column([
-            # En-tête de propriété
-            ft.Row([
-                ft.Text(
-                    key,
-                    size=16,
-                    weight=ft.FontWeight.W_700,
-                    color=theme['text']
-                ),
-                ft.Container(
-                    content=ft.Text(
-                        "REQ",
-                        size=10,
-                        weight=ft.FontWeight.W_800,
-                        color="#FFFFFF"
-                    ),
-                    bgcolor="#FF3B30",
-                    padding=ft.padding.symmetric(6, 2),
-                    border_radius=4,
-                    visible=val.get('required', False)
-                )
-            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-            
-            # Détails
-            ft.Column([
-                ft.Text(
-                    val.get('type', 'unknown'),
-                    size=13,
-                    weight=ft.FontWeight.W_600,
-                    color=theme['accent']
-                ),
-                ft.Text(
-                    f"Défaut: {val.get('default', 'null')}",
-                    size=13,
-                    color=theme['subtext']
-                )
-            ], spacing=4),
-            
-            # Explication
-            ft.Container(
-                content=ft.Row([
-                    ft.Icon(
-                        Icons.INFO_OUTLINE,
-                        size=14,
-                        color=theme['primary']
-                    ),
-                    ft.Text(
-                        explanation,
-                        size=12,
-                        color=theme['subtext'],
-                        italic=True,
-                        expand=True
-                    )
-                ], spacing=6),
-                bgcolor=theme['codebg'],
-                padding=8,
-                border_radius=6,
-                visible=explanation is not None
-            )
-        ], spacing=8)
-        
+    def create_property_row():
+        # Structure seule : le contenu est posé par bind_property_row
         return ft.Container(
-            content=prop_container,
+            content=ft.Column([
+                # En-tête de propriété
+                ft.Row([
+                    themed(ft.Text(
+                        size=16,
+                        weight=ft.FontWeight.W_700
+                    ), color='text'),
+                    ft.Container(
+                        content=ft.Text(
+                            "REQ",
+                            size=10,
+                            weight=ft.FontWeight.W_800,
+                            color="#FFFFFF"
+                        ),
+                        bgcolor="#FF3B30",
+                        padding=ft.padding.symmetric(6, 2),
+                        border_radius=4
+                    )
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                
+                # Détails
+                ft.Column([
+                    themed(ft.Text(
+                        size=13,
+                        weight=ft.FontWeight.W_600
+                    ), color='accent'),
+                    themed(ft.Text(
+                        size=13
+                    ), color='subtext')
+                ], spacing=4),
+                
+                # Explication
+                themed(ft.Container(
+                    content=ft.Row([
+                        themed(ft.Icon(
+                            Icons.INFO_OUTLINE,
+                            size=14
+                        ), color='primary'),
+                        themed(ft.Text(
+                            size=12,
+                            italic=True,
+                            expand=True
+                        ), color='subtext')
+                    ], spacing=6),
+                    padding=8,
+                    border_radius=6
+                ), bgcolor='codebg')
+            ], spacing=8),
             padding=ft.padding.symmetric(20, 16),
-            border=ft.border.only(
-                bottom=ft.border.BorderSide(1, theme['border'])
-            ) if not is_last else None
+            margin=ft.margin.symmetric(20, 0)
         )
     
-    def render_detail_view():
-        theme = get_theme()
-        item = json_data[current_key]
-        has_code = '```python' in item.get('description', '')
-        is_fav = current_key in favorites
+    def render_property_row(prop, is_first, is_last):
+        # `prop` : tuple de ComponentDoc.property. Reprend une ligne libérée
+        # par une vue évincée du cache, sinon en construit une : seules les
+        # valeurs sont réaffectées.
+        try:
+            row = property_row_pool.pop()
+        except IndexError:  # Pool vide (ou vidé par le préchargement)
+            row = create_property_row()
+        key, type_, default, is_required, explanation = prop
+        header, details, explanation_box = row.content.controls
+        name, required = header.controls
+        type_text, default_text = details.controls
+        name.value = key
+        required.visible = is_required
+        type_text.value = type_
+        default_text.value = f"Défaut: {default}"
+        explanation_box.content.controls[1].value = explanation
+        explanation_box.visible = explanation is not None
+        
+        # Chaque ligne porte sa part de la carte : elles sont des enfants
+        # directs de la ListView pour pouvoir être construites à la demande.
+        row.border_radius = ft.border_radius.only(
+            top_left=16 if is_first else 0,
+            top_right=16 if is_first else 0,
+            bottom_left=16 if is_last else 0,
+            bottom_right=16 if is_last else 0
+        )
+        return themed(row, bgcolor='card', border=lambda t: ft.border.only(
+            bottom=ft.border.BorderSide(1, t['border'])
+        ) if not is_last else None)
+    
+    def render_detail_view(key=None):
+        # Vue du composant `key` (par défaut celui affiché) ; peut être
+        # construite hors du thread de l'interface par le préchargement.
+        key = key or current_key
+        item = json_data[key]
+        info = describe(key)
+        is_fav = key in favorites
+        
+        # Description longue : aperçu d'abord, texte complet à la demande
+        markdown = ft.Markdown(
+            info.preview or info.markdown,
+            selectable=True,
+            extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
+            code_theme=ft.MarkdownCodeTheme.ATOM_ONE_DARK
+        )
+        expand_button = ft.TextButton(
+            "Afficher toute la description",
+            icon=Icons.EXPAND_MORE,
+            visible=info.preview is not None
+        )
+        
+        @batched
+        def expand_description(e):
+            markdown.value = info.markdown
+            expand_button.visible = False
+            ui.update(markdown, expand_button)
+        
+        expand_button.on_click = expand_description
         
         children = [
             # En-tête
             ft.Container(
                 content=ft.Row([
                     ft.Column([
-                        ft.Text(
-                            current_key,
+                        themed(ft.Text(
+                            key,
                             size=30,
-                            weight=ft.FontWeight.W_800,
-                            color=theme['text']
-                        ),
-                        ft.Text(
+                            weight=ft.FontWeight.W_800
+                        ), color='text'),
+                        themed(ft.Text(
                             "COMPONENT",
                             size=13,
-                            weight=ft.FontWeight.W_600,
-                            color=theme['accent']
-                        )
+                            weight=ft.FontWeight.W_600
+                        ), color='accent')
                     ], spacing=4, expand=True),
-                    ft.IconButton(
+                    themed(ft.IconButton(
                         icon=Icons.STAR if is_fav else Icons.STAR_OUTLINE,
-                        icon_color="#FFD700" if is_fav else theme['subtext'],
                         icon_size=28,
-                        on_click=lambda _: toggle_favorite(current_key)
-                    )
+                        on_click=lambda _: toggle_favorite(key)
+                    ), icon_color=lambda t: "#FFD700" if is_fav else t['subtext'])
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 padding=ft.padding.symmetric(20, 20)
             ),
@@ -472,122 +3127,202 @@ def main(page: ft.Page):
             # Actions
             ft.Container(
                 content=ft.Row([
-                    ft.ElevatedButton(
+                    themed(ft.ElevatedButton(
                         "Copier l'exemple",
                         icon=Icons.COPY_OUTLINED,
-                        bgcolor=theme['success'],
                         color="#FFFFFF",
-                        on_click=lambda _: copy_code(item.get('description', '')),
+                        on_click=lambda _: copy_code(info),
                         
-                    )
+                    ), bgcolor='success')
                 ], spacing=10),
                 padding=ft.padding.symmetric(24, 0)
-            ) if has_code else ft.Container(height=0),
+            ) if info.has_code else ft.Container(height=0),
             
             # Description
-            ft.Container(
+            themed(ft.Container(
                 content=ft.Column([
-                    ft.Text(
+                    themed(ft.Text(
                         "DESCRIPTION",
                         size=12,
-                        weight=ft.FontWeight.W_700,
-                        color=theme['subtext']
-                    ),
-                    ft.Markdown(
-                        item.get('description', '_Aucune description_'),
-                        selectable=True,
-                        extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
-                        code_theme=ft.MarkdownCodeTheme.ATOM_ONE_DARK
-                    )
+                        weight=ft.FontWeight.W_700
+                    ), color='subtext'),
+                    markdown,
+                    expand_button
                 ], spacing=15),
-                bgcolor=theme['card'],
                 padding=20,
                 border_radius=16,
-                shadow=ft.BoxShadow(
-                    spread_radius=0,
-                    blur_radius=10,
-                    color=Colors.with_opacity(0.1, theme['text']),
-                    offset=ft.Offset(0, 4)
-                ),
                 margin=ft.margin.symmetric(20, 0)
-            ),
+            ), bgcolor='card', shadow=lambda t: ft.BoxShadow(
+                spread_radius=0,
+                blur_radius=10,
+                color=Colors.with_opacity(0.1, t['text']),
+                offset=ft.Offset(0, 4)
+            )),
             
             # Propriétés
             ft.Container(
-                content=ft.Text(
+                content=themed(ft.Text(
                     "Propriétés",
                     size=20,
-                    weight=ft.FontWeight.W_700,
-                    color=theme['text']
-                ),
+                    weight=ft.FontWeight.W_700
+                ), color='text'),
                 padding=ft.padding.only(20, 20, 20, 15)
             )
         ]
         
-        # Ajouter les propriétés
-        if item.get('properties'):
-            props = list(item['properties'].items())
-            children.append(
-                ft.Container(
-                    content=ft.Column(
-                        controls=[
-                            render_property_row(key, val, i == len(props) - 1)
-                            for i, (key, val) in enumerate(props)
-                        ],
-                        spacing=0
-                    ),
-                    bgcolor=theme['card'],
-                    border_radius=16,
-                    shadow=ft.BoxShadow(
-                        spread_radius=0,
-                        blur_radius=10,
-                        color=Colors.with_opacity(0.1, theme['text']),
-                        offset=ft.Offset(0, 4)
-                    ),
-                    margin=ft.margin.symmetric(20, 0),
-                    clip_behavior=ft.ClipBehavior.ANTI_ALIAS
-                )
+        view = ft.ListView(
+            controls=children,
+            spacing=0,
+            expand=True,
+            build_controls_on_demand=True,
+            data=[]  # Lignes de propriétés empruntées au pool
+        )
+        
+        # Ajouter les propriétés : seule la première tranche est construite,
+        # les suivantes au fil du défilement ou via « Afficher plus ».
+        count = len(item)
+        if count:
+            shown = 0
+            more_button = ft.TextButton(on_click=lambda _: show_more_properties())
+            footer = ft.Container(
+                content=more_button,
+                padding=ft.padding.symmetric(20, 10),
+                alignment=ft.alignment.center
             )
+            
+            # Hors action : la vue peut être construite par le thread de
+            # préchargement, qui n'envoie rien et n'a pas à figurer dans
+            # l'historique des envois
+            def add_property_rows():
+                nonlocal shown
+                end = min(shown + PROPERTY_PAGE_SIZE, count)
+                with tracer.span('render_property_rows', rows=end - shown):
+                    rows = [
+                        render_property_row(item.property(i), i == 0, i == count - 1)
+                        for i in range(shown, end)
+                    ]
+                view.data.extend(rows)  # Rendues au pool quand la vue est évincée
+                shown = end
+                remaining = count - shown
+                more_button.text = f"Afficher plus ({remaining} restante{'s' if remaining > 1 else ''})"
+                footer.visible = remaining > 0
+                at = view.controls.index(footer) if footer in view.controls else len(view.controls)
+                view.controls.insert(at, PropertySlice(rows, spacing=0))
+            
+            @batched
+            def show_more_properties():
+                add_property_rows()
+                ui.update(view)
+            
+            def on_view_scroll(e: ft.OnScrollEvent):
+                if shown < count and e.max_scroll_extent - e.pixels < PROPERTY_LOAD_AHEAD:
+                    show_more_properties()
+            
+            add_property_rows()
+            view.controls.append(footer)
+            view.on_scroll = on_view_scroll
+            view.on_scroll_interval = 50
         else:
-            children.append(
+            view.controls.append(
                 ft.Container(
-                    content=ft.Text(
+                    content=themed(ft.Text(
                         "Aucune propriété.",
                         size=14,
-                        color=theme['subtext'],
                         italic=True
-                    ),
+                    ), color='subtext'),
                     padding=ft.padding.symmetric(20, 10)
                 )
             )
         
         # Espace en bas
-        children.append(ft.Container(height=50))
+        view.controls.append(ft.Container(height=50))
         
-        return ft.Column(
-            controls=children,
-            spacing=0,
-            scroll=ft.ScrollMode.AUTO,
-            expand=True
-        )
+        return view
+    
+    # --- PRÉCHARGEMENT ---
+    def prefetch_targets(key):
+        # Voisins dans l'ordre du tiroir (le suivant d'abord), puis favoris
+        order = drawer_keys or search_index.keys
+        try:
+            i = order.index(key)
+        except ValueError:
+            i = None
+        targets = []
+        if i is not None:
+            for step in range(1, PREFETCH_NEIGHBOURS + 1):
+                targets.extend(order[j] for j in (i + step, i - step) if 0 <= j < len(order))
+        targets.extend(list(favorites)[:PREFETCH_FAVORITES])
+        targets = [k for k in dict.fromkeys(targets) if k != key and k in json_data]
+        # Pas plus que le cache n'en garde : sinon elles s'évinceraient entre elles
+        return targets[:prefetched_views.maxsize]
+    
+    def prefetch_views(key, is_current):
+        # Exécuté dans le thread du Debouncer après l'affichage de `key` :
+        # décode (catalogue paresseux) et construit les vues voisines, une à
+        # une, tant qu'aucune autre sélection n'a eu lieu.
+        catalog = json_data
+        for target in prefetch_targets(key):
+            if not is_current() or catalog is not json_data:
+                return
+            cache_key = (target, target in favorites)
+            if cache_key in detail_views or cache_key in prefetched_views:
+                continue
+            try:
+                with tracer.span('prefetch_view', key=target):
+                    view = render_detail_view(target)
+            except CatalogChanged:
+                return  # Fichier réécrit : plus rien à précharger avant le rechargement
+            if catalog is not json_data:
+                recycle_rows(view.data)  # Catalogue remplacé entre-temps
+                return
+            prefetched_views.put(cache_key, view)
+            prefetch_stats.built += 1
+    
+    @batched
+    def displayed_view():
+        # Vue détaillée affichée, s'il y en a une
+        return next((c for c in content_column.controls if isinstance(c, ft.ListView)), None)
     
     def render_content():
-        theme = get_theme()
         content_column.controls.clear()
         
         if not json_data or not current_key:
             content_column.controls.append(render_empty_state())
         else:
-            content_column.controls.append(render_detail_view())
+            # Réutilise l'arbre déjà construit pour ce composant
+            # (le thème n'en fait pas partie : les vues sont recolorées en place)
+            cache_key = (current_key, current_key in favorites)
+            view = detail_views.get(cache_key)
+            if view is None:
+                # Préconstruite en arrière-plan, sinon construite maintenant
+                view = prefetched_views.take(cache_key)
+                if view is not None:
+                    prefetch_stats.hits += 1
+                else:
+                    prefetch_stats.misses += 1
+                    try:
+                        with tracer.span('render_detail_view') as trace:
+                            view = render_detail_view()
+                            if tracer.enabled:
+                                trace['controls'] = count_controls(view)
+                    except CatalogChanged:
+                        view = None
+                if view is not None:
+                    detail_views.put(cache_key, view)
+            if view is None:
+                content_column.controls.append(render_changed_state())
+            else:
+                content_column.controls.append(view)
+                prefetcher.submit(functools.partial(prefetch_views, current_key))
         
-        page.update()
+        ui.update()
     
     # --- BARRE DE NAVIGATION ---
     nav_bar_ref = ft.Ref[ft.Container]()
+    appbar_count_ref = ft.Ref[ft.Text]()
     
+    @batched
     def update_nav_bar():
-        theme = get_theme()
-        
         if search_mode:
             # Mode recherche
             nav_bar_ref.current.content = ft.Row([
@@ -596,17 +3331,22 @@ def main(page: ft.Page):
                     icon_size=24,
                     on_click=clear_appbar_search
                 ),
-                ft.TextField(
+                themed(ft.TextField(
                     hint_text="Rechercher un composant...",
                     border_color=Colors.TRANSPARENT,
-                    bgcolor=theme['codebg'],
-                    color=theme['text'],
                     on_change=on_appbar_search_change,
+                    on_focus=set_typing('appbar'),
+                    on_blur=set_typing('appbar'),
                     value=appbar_search_query,
                     autofocus=True,
                     expand=True,
                     text_size=16
-                ),
+                ), bgcolor='codebg', color='text'),
+                themed(ft.Text(
+                    format_result_count(len(search_index.search(appbar_search_query))),
+                    ref=appbar_count_ref,
+                    size=12
+                ), color='subtext'),
                 ft.IconButton(
                     icon=Icons.CLOSE,
                     icon_size=22,
@@ -623,65 +3363,214 @@ def main(page: ft.Page):
                     on_click=lambda _: open_drawer(),
                     disabled=not json_data
                 ),
-                ft.Text(
+                themed(ft.Text(
                     "JSON Docs",
                     size=17,
                     weight=ft.FontWeight.W_700,
-                    expand=True,
-                    color=theme['text']
-                ),
+                    expand=True
+                ), color='text'),
                 ft.IconButton(
                     icon=Icons.SEARCH,
                     icon_size=24,
                     on_click=toggle_search_mode,
                     disabled=not json_data
                 ),
-                ft.IconButton(
-                    icon=Icons.NIGHTLIGHT_ROUND if theme_mode == 'light' else Icons.WB_SUNNY,
+                themed(ft.IconButton(
+                    icon=Icons.SYNC if watch_mode else Icons.SYNC_DISABLED,
+                    icon_size=22,
+                    tooltip="Recharger automatiquement le fichier",
+                    on_click=toggle_watch_mode
+                ), icon_color=lambda t: t['primary'] if watch_mode else t['subtext']),
+                themed(ft.IconButton(
+                    icon=Icons.SPEED,
+                    icon_size=22,
+                    tooltip="Performances",
+                    on_click=toggle_perf_mode
+                ), icon_color=lambda t: t['primary'] if perf_mode else t['subtext']),
+                themed(ft.IconButton(
                     icon_size=22,
                     on_click=toggle_theme
-                ),
-                ft.IconButton(
+                ), icon=lambda t: Icons.NIGHTLIGHT_ROUND if theme_mode == 'light' else Icons.WB_SUNNY),
+                themed(ft.IconButton(
+                    icon=Icons.FILE_OPEN_OUTLINED,
+                    icon_size=24,
+                    tooltip="Ouvrir un ou plusieurs fichiers",
+                    visible=not server_mode,  # Fichiers choisis au lancement du serveur
+                    on_click=lambda _: file_picker.pick_files(
+                        allowed_extensions=["json"],
+                        allow_multiple=True
+                    )
+                ), icon_color='primary'),
+                themed(ft.IconButton(
                     icon=Icons.FOLDER_OPEN_OUTLINED,
                     icon_size=24,
-                    icon_color=theme['primary'],
-                    on_click=lambda _: file_picker.pick_files(allowed_extensions=["json"])
-                )
+                    tooltip="Ouvrir un dossier",
+                    visible=not server_mode,
+                    on_click=lambda _: file_picker.get_directory_path()
+                ), icon_color='primary')
             ], spacing=5)
         
-        page.update()
+        ui.update()
     
-    nav_bar = ft.Container(
+    nav_bar = themed(ft.Container(
         ref=nav_bar_ref,
         content=ft.Row([]),  # Sera rempli par update_nav_bar
-        padding=ft.padding.symmetric(20, 15),
-        border=ft.border.only(bottom=ft.border.BorderSide(1, get_theme()['border']))
-    )
+        padding=ft.padding.symmetric(20, 15)
+    ), border=lambda t: ft.border.only(bottom=ft.border.BorderSide(1, t['border'])))
     
     # --- DRAWER ---
-    drawer = ft.NavigationDrawer(
-        ref=drawer_ref,
-        controls=[],
-        bgcolor=get_theme()['bg']
+    # Construit une seule fois ; seules la liste et les entrées modifiées
+    # sont renvoyées au client par la suite.
+    drawer_header = themed(ft.Container(
+        content=ft.Row([
+            themed(ft.Text(
+                "Bibliothèque",
+                size=22,
+                weight=ft.FontWeight.W_800
+            ), color='text'),
+            themed(ft.IconButton(
+                icon=Icons.CLOSE,
+                on_click=close_drawer
+            ), icon_color='subtext')
+        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+        padding=20
+    ), border=lambda t: ft.border.only(bottom=ft.border.BorderSide(1, t['border'])))
+    drawer_search = themed(ft.TextField(
+        hint_text="Rechercher...",
+        prefix_icon=Icons.SEARCH,
+        border_color=Colors.TRANSPARENT,
+        on_change=on_drawer_search_change,
+        on_focus=set_typing('drawer'),
+        on_blur=set_typing('drawer'),
+        value=drawer_search_query
+    ), bgcolor='codebg', color='text')
+    drawer_count = themed(ft.Text(size=12), color='subtext')
+    # Hauteur des entrées hors fenêtre, au-dessus et au-dessous
+    drawer_top = ft.Container(height=0)
+    drawer_bottom = ft.Container(height=0)
+    drawer_list = ft.ListView(
+        build_controls_on_demand=True,
+        on_scroll=on_drawer_scroll,
+        on_scroll_interval=50,
+        spacing=0,
+        expand=True
     )
+    drawer = themed(ft.NavigationDrawer(
+        ref=drawer_ref,
+        controls=[
+            # En-tête
+            drawer_header,
+            
+            # Barre de recherche
+            ft.Container(
+                content=drawer_search,
+                padding=ft.padding.symmetric(15, 10)
+            ),
+            
+            # Nombre de résultats
+            ft.Container(
+                content=drawer_count,
+                padding=ft.padding.only(20, 0, 20, 5)
+            ),
+            
+            # Liste des items
+            ft.Container(
+                content=drawer_list,
+                expand=True
+            )
+        ]
+    ), bgcolor='bg')
     
     # --- LAYOUT PRINCIPAL ---
     page.add(
         ft.Column([
             nav_bar,
+            perf_panel,
+            search_results_panel,
             content_column
         ], spacing=0, expand=True)
     )
     
     page.drawer = drawer
+    # Écrit les favoris encore en attente à la fermeture de la session
+    def on_disconnect(e):
+        favorites.flush()
+        stop_watch()
+        prefetcher.cancel()
+        release_catalog()
+        if perf_stop:
+            perf_stop.set()
+    
+    page.on_disconnect = on_disconnect
+    page.on_keyboard_event = on_keyboard_event
+    
+    # Points d'entrée internes pour bench.py (sans effet sur l'application)
+    page.session.set("hooks", {
+        'pick_file_result': pick_file_result,
+        'filter_drawer_keys': filter_drawer_keys,
+        'update_drawer_items': update_drawer_items,
+        'drawer_scroll': on_drawer_scroll,
+        'render_detail_view': render_detail_view,
+        'displayed_view': displayed_view,
+        'render_property_row': render_property_row,
+        'select_component': select_component,
+        'navigate': navigate,
+        'catalog': lambda: json_data,
+        'fulltext_index': lambda: fulltext_index,
+        'tracer': tracer,
+        'prefetch_stats': prefetch_stats,
+        'loads_done': lambda: loads_done,
+        'disconnect': on_disconnect,
+    })
     
     # Initialisation
-    load_favorites()
-    apply_theme()
-    update_nav_bar()
-    render_content()
+    with ui.action('init'):
+        apply_theme()
+        update_nav_bar()
+        render_content()
+        if server_mode:
+            # Déjà en mémoire depuis le démarrage : aucune relecture
+            start_load(SERVER_DOCS)
 
 
 # Point d'entrée
 if __name__ == "__main__":
-    ft.app(target=main)
+    # Exécutable figé : les processus du pool ne doivent pas relancer l'application
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="JSON Docs Viewer")
+    parser.add_argument(
+        "docs", nargs="*",
+        help="fichiers JSON ou dossier ouverts par chaque session (mode serveur)"
+    )
+    parser.add_argument(
+        "--server", action="store_true",
+        help="sert l'application sur le web, sans fenêtre, à plusieurs sessions"
+    )
+    parser.add_argument("--port", type=int, default=8550, help="port du mode serveur")
+    parser.add_argument(
+        "--export", metavar="DOSSIER",
+        help="génère la documentation en HTML statique dans ce dossier, sans interface"
+    )
+    parser.add_argument("--workers", type=int, help="processus de l'export (un par cœur par défaut)")
+    args = parser.parse_args()
+    
+    if args.export:
+        if not args.docs:
+            parser.error("l'export attend au moins un fichier ou dossier")
+        if markdown is None:
+            print("Attention : bibliothèque markdown absente (pip install markdown), "
+                  "les descriptions sont exportées sans mise en forme", file=sys.stderr)
+        progress = LoadProgress(0)
+        rendered, unchanged, removed = export_site(args.docs, args.export, args.workers, progress)
+        print(f"{rendered} pages générées, {unchanged} inchangées, {removed} supprimées "
+              f"en {progress.elapsed:.2f} s ({progress.backend})")
+    elif args.server:
+        if not args.docs:
+            parser.error("le mode serveur attend au moins un fichier ou dossier")
+        SERVER_DOCS.extend(args.docs)
+        # Référence permanente : le catalogue reste chargé même sans session,
+        # et suit les fichiers quand ils sont régénérés
+        server_catalog = ServerCatalog(catalog_store, SERVER_DOCS)
+        ft.app(target=main, view=None, port=args.port)
+    else:
+        ft.app(target=main)